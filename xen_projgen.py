@@ -1,10 +1,20 @@
 import sys
 import os
 import re
-import subprocess
-from typing import List
+import json
+import io
+import time
+import errno
+import argparse
+import functools
+import contextlib
+import contextvars
+from typing import List, Optional, Tuple
 from collections import namedtuple
 
+# tomllib, subprocess and concurrent.futures are imported by the functions using them, importing them up front
+# took more time than the rest of the startup combined while most runs need none of them
+
 ProjectConfig = namedtuple('ProjectConfig', [
     'proj_name',
     'target_name',
@@ -17,11 +27,22 @@ ProjectConfig = namedtuple('ProjectConfig', [
     'should_gen_include_dir',
     'is_include_dir_inside_src',
     'should_include_tests',
+    'should_split_tests',
+    'should_include_benchmarks',
     'has_proj_name_dir',
     'should_gen_vscode_files',
     'should_gen_workspace_file',
     'should_add_src_and_include_dirs_to_ws',
+    'should_gen_cmake_presets',
     'has_proj_dir',
+    'use_cmake_flag_parser',
+    'use_compiler_cache',
+    'use_precompiled_headers',
+    'use_unity_build',
+    'use_lto',
+    'use_pgo',
+    'use_sanitizer_builds',
+    'use_source_manifest',
     'is_out_in_build_dir',
     'should_gen_readme',
     'should_init_git',
@@ -35,6 +56,77 @@ reserved_names = {'com1', 'com2', 'com3', 'com4', 'com5', 'com6', 'com7', 'com8'
 illegal_file_names = {'src', 'include', 'test', 'libs', 'build',
                        'out', 'project', 'config', 'utils', '.vscode', '.git'}
 
+target_types = ['Executable', 'Dynamic Library', 'Static Library']
+c_standards = ['C89', 'C90', 'C99', 'C11', 'C17', 'C23']
+cpp_standards = ['C++98', 'C++11', 'C++14', 'C++17', 'C++20', 'C++23', 'C++26']
+
+# Used for the settings left out in non-interactive mode, proj_name has no default
+default_proj_settings = {
+    'target_name': '',
+    'target_type': 'Executable',
+    'use_c': False,
+    'c_std': '17',
+    'use_cpp': True,
+    'cpp_std': '17',
+    'should_list_h_files': False,
+    'should_gen_include_dir': False,
+    'is_include_dir_inside_src': False,
+    'should_include_tests': False,
+    'should_split_tests': False,
+    'should_include_benchmarks': False,
+    'has_proj_name_dir': False,
+    'should_gen_vscode_files': False,
+    'should_gen_workspace_file': False,
+    'should_add_src_and_include_dirs_to_ws': False,
+    'should_gen_cmake_presets': False,
+    'has_proj_dir': False,
+    'use_cmake_flag_parser': False,
+    'use_compiler_cache': False,
+    'use_precompiled_headers': False,
+    'use_unity_build': False,
+    'use_lto': False,
+    'use_pgo': False,
+    'use_sanitizer_builds': False,
+    'use_source_manifest': False,
+    'is_out_in_build_dir': False,
+    'should_gen_readme': False,
+    'should_init_git': False,
+    'should_commit_git': False
+}
+
+placeholder_pattern = re.compile(r'\{\[\((\w+)\)\]\}')
+
+@functools.lru_cache(maxsize = None)
+def parse_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # Splits the template into its literal segments and the placeholder names between them
+    parts = placeholder_pattern.split(template)
+    literals = tuple(parts[0::2])
+    names = tuple(parts[1::2])
+
+    for literal in literals:
+        if '{[(' in literal:
+            raise ValueError(f'Malformed placeholder in template near: {literal[:40]!r}')
+
+    return literals, names
+
+def render_template(template: str, **values: str) -> str:
+    literals, names = parse_template(template)
+
+    missing = set(names) - values.keys()
+    if missing:
+        raise KeyError(f"No value given for template placeholders: {', '.join(sorted(missing))}")
+
+    unknown = values.keys() - set(names)
+    if unknown:
+        raise KeyError(f"Template has no placeholders named: {', '.join(sorted(unknown))}")
+
+    segments = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        segments.append(values[name])
+        segments.append(literal)
+
+    return ''.join(segments)
+
 def message(msg: str):
     print(f'## {msg}')
 
@@ -105,17 +197,146 @@ def sanitize_target_name(name: str) -> str:
 
     return name
 
+# The output backends the project is generated through, any object with make_dir, write_file and list_files works
+class DiskOutput:
+    # Writes the project to the file system, used unless another backend is given
+    def make_dir(self, path: str):
+        os.mkdir(path)
+
+    def write_file(self, path: str, content: str):
+        with open(path, 'w', encoding = 'utf-8') as file:
+            file.write(content)
+
+    def list_files(self, path: str) -> List[str]:
+        return [os.path.join(dir_path, file_name) for dir_path, _, file_names in os.walk(path) for file_name in file_names]
+
+class MemoryOutput:
+    # Keeps the project in memory without touching the disk, e.g. for tests and dry runs
+    def __init__(self):
+        self.dirs = set()
+        self.files = {}
+
+    def make_dir(self, path: str):
+        path = os.path.normpath(path)
+
+        if path in self.dirs or path in self.files:
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+
+        self.dirs.add(path)
+
+    def write_file(self, path: str, content: str):
+        self.files[os.path.normpath(path)] = content
+
+    def list_files(self, path: str) -> List[str]:
+        prefix = os.path.join(os.path.normpath(path), '')
+        return [file_path for file_path in self.files if file_path.startswith(prefix)]
+
+class ArchiveOutput:
+    # Streams the project into a tar.gz or zip archive while it is generated, the stream does not have to be seekable
+    archive_formats = ['tar.gz', 'zip']
+
+    def __init__(self, stream, archive_format: str = 'tar.gz'):
+        if archive_format not in self.archive_formats:
+            raise ValueError(f"Unsupported archive format '{archive_format}', expected one of: {', '.join(self.archive_formats)}")
+
+        self.stream = stream
+        self.archive_format = archive_format
+        self.archive = None
+        self.dirs = set()
+        self.files = set()
+        self.mtime = time.time()
+
+    # Opened on the first entry, so nothing reaches the stream if the project is rejected before any file is generated
+    def open_archive(self):
+        if self.archive_format == 'tar.gz':
+            import tarfile
+            self.archive = tarfile.open(fileobj = self.stream, mode = 'w|gz')
+        else:
+            import zipfile
+            self.archive = zipfile.ZipFile(self.stream, 'w', zipfile.ZIP_DEFLATED)
+
+    @staticmethod
+    def entry_name(path: str) -> str:
+        return os.path.normpath(path).replace(os.sep, '/').lstrip('/')
+
+    def add_entry(self, name: str, data: Optional[bytes]):
+        if self.archive is None:
+            self.open_archive()
+
+        if self.archive_format == 'tar.gz':
+            import tarfile
+            info = tarfile.TarInfo(name)
+            info.mtime = int(self.mtime)
+
+            if data is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+            else:
+                info.size = len(data)
+                info.mode = 0o644
+
+            self.archive.addfile(info, io.BytesIO(data) if data is not None else None)
+        else:
+            import zipfile
+            info = zipfile.ZipInfo(name if data is not None else f'{name}/', time.localtime(self.mtime)[:6])
+
+            if data is None:
+                info.external_attr = (0o40755 << 16) | 0x10
+            else:
+                info.external_attr = 0o100644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+
+            self.archive.writestr(info, data or b'')
+
+    def make_dir(self, path: str):
+        name = self.entry_name(path)
+
+        if name in self.dirs or name in self.files:
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+
+        self.dirs.add(name)
+        self.add_entry(name, None)
+
+    def write_file(self, path: str, content: str):
+        name = self.entry_name(path)
+
+        # Archives can hold the same name twice, but extracting them would keep only the last one anyway
+        if name in self.files:
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+
+        self.files.add(name)
+        self.add_entry(name, content.encode('utf-8'))
+
+    def list_files(self, path: str) -> List[str]:
+        prefix = f'{self.entry_name(path)}/'
+        return [os.path.join(path, name[len(prefix):]) for name in self.files if name.startswith(prefix)]
+
+    def close(self):
+        if self.archive is None:
+            self.open_archive()
+
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A failed generation is left unterminated, so the partial archive fails to extract rather than passing as complete
+        if exc_type is None:
+            self.close()
+
+current_output = contextvars.ContextVar('current_output', default = DiskOutput())
+
 def gen_dir(cwd: str, dir_name: str) -> str:
     dir_path = os.path.join(cwd, dir_name)
-    os.mkdir(dir_path)
+    current_output.get().make_dir(dir_path)
     return dir_path
 
 def gen_file(cwd: str, file_name: str, content: str) -> str:
     file_path = os.path.join(cwd, file_name)
 
     try:
-        with open(file_path, 'w', encoding = 'utf-8') as file:
-            file.write(content)
+        current_output.get().write_file(file_path, content)
     except Exception as e:
         print(f'Error creating file {file_path}: {e}')
         sys.exit(4)
@@ -240,7 +461,7 @@ def gen_vscode_dir(cwd: str, conf: ProjectConfig):
 }"""
 
     bin_dir = '${workspaceFolder}/build/out/bin' if conf.is_out_in_build_dir else '${workspaceFolder}/out/bin'
-    launch_json = launch_json.replace('{[(CWD)]}', bin_dir)
+    launch_json = render_template(launch_json, CWD = bin_dir)
 
     vscode_dir = gen_dir(cwd, '.vscode')
     gen_file(vscode_dir, 'launch.json', launch_json)
@@ -262,6 +483,11 @@ def gen_build_dir(cwd: str, conf: ProjectConfig):
         gen_dir(test_dir, 'Debug')
         gen_dir(test_dir, 'Release')
 
+    if conf.should_include_benchmarks:
+        bench_dir = gen_dir(out_dir, 'bench')
+        gen_dir(bench_dir, 'Debug')
+        gen_dir(bench_dir, 'Release')
+
 def gen_utils_dir(cwd: str, conf: ProjectConfig):
     fetch_flags_py = r"""# This file was generated by Xen ProjGen.
 # File: fetch_flags.py
@@ -271,88 +497,463 @@ def gen_utils_dir(cwd: str, conf: ProjectConfig):
 # Github: https://github.com/XeniaPhe/Xen-ProjGen
 # Description: Parses the compiler_flags.yaml file and retrieves the flags for CMake
 
+import os
 import re
 import sys
+import hashlib
+
+compilers = ["gcc", "clang", "msvc"]
+build_types = ["debug", "release", "minsizerel", "relwithdebinfo", "pgogenerate", "pgouse", "asan", "tsan", "ubsan", "msan"]
+profiles = ["performance", "hardening"]
+entry_keys = ["flag", "description", "documentation", "tags", "enabled"]
+
+args = sys.argv[1:]
+profile = ""
 
-if len(sys.argv) != 3:
-    print("Usage: script.py <compiler> <build_type>", file = sys.stderr)
+# An optional profile expression (e.g. "+perf -warnings") composes the flags of every build type from profiles and tags
+if len(args) > 3 and args[2] == "--profile":
+    profile = " ".join(args[3:]).lower()
+    args = args[:2]
+
+if len(args) != 2:
+    print("Usage: script.py <compiler> <build_type> [--profile <expression>]", file = sys.stderr)
+    print("       script.py --cmake <output_file> [--profile <expression>]", file = sys.stderr)
+    sys.exit(1)
+
+def fail(message):
+    print(message, file = sys.stderr)
     sys.exit(1)
 
-target_compiler = sys.argv[1].lower()
-target_build_type = sys.argv[2].lower()
+yaml_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "compiler_flags.yaml")
 
-file_content = ""
 try:
-    with open("../config/compiler_flags.yaml", 'r') as file:
-        file_content = file.read()
+    with open(yaml_path, 'rb') as file:
+        raw_content = file.read()
 except FileNotFoundError:
-    print("The file compiler_flags.yaml not found!")
-except IOError as e:
-    print(f"An I/O error occurred while accessing compiler_flags.yaml:\n {e}")
-except Exception as e:
-    print(f"An unexpected error occurred:\n {e}")
-
-flags = []
-current_compiler = None
-current_build_type = None
-current_flag = None
-
-# Regex patterns to identify sections and flag details
-compiler_pattern = re.compile(r'^\s*(gcc|clang|msvc):', re.IGNORECASE)
-build_type_pattern = re.compile(r'^\s*(debug|release|minsizerel|relwithdebinfo):', re.IGNORECASE)
-flag_pattern = re.compile(r'^\s*- flag: "(.*)"')
-enabled_pattern = re.compile(r'^\s*enabled: (true|false)')
-
-lines = file_content.splitlines()
-
-for line in lines:
-    # Skip comments or empty lines
-    if not line.strip() or line.strip().startswith('#'):
-        continue
-    
-    # Detect the compiler section (gcc, clang, msvc)
-    compiler_match = compiler_pattern.match(line)
-    if compiler_match:
-        # Break out if all the requested data has been processed
-        if current_compiler == target_compiler:
-            break
-
-        current_compiler = compiler_match.group(1).lower()
-        continue
+    fail(f"The file compiler_flags.yaml not found at {os.path.normpath(yaml_path)}")
+except OSError as e:
+    fail(f"An I/O error occurred while accessing compiler_flags.yaml:\n {e}")
 
-    if current_compiler != target_compiler:
-        continue
-    
-    # Detect the build type (debug, release)
-    build_type_match = build_type_pattern.match(line)
-    if build_type_match:
-        # Break out if all the requested data has been processed
-        if current_build_type == target_build_type:
-            break
-
-        current_build_type = build_type_match.group(1).lower()
-        continue
+file_hash = hashlib.md5(raw_content).hexdigest()
 
-    if current_build_type != target_build_type:
-        continue
-    
-    # Parse flags and enabled status
-    if not current_flag:
-        flag_match = flag_pattern.match(line)
-        if flag_match:
-            current_flag = flag_match.group(1)
+try:
+    file_content = raw_content.decode('utf-8-sig')
+except UnicodeDecodeError as e:
+    fail(f"compiler_flags.yaml is not valid UTF-8:\n {e}")
 
-        continue
-    
-    enabled_match = enabled_pattern.match(line)
-    if enabled_match:
-        if enabled_match.group(1).lower() == "true":
-            flags.append(current_flag)
+bool_values = {"true": True, "yes": True, "on": True, "false": False, "no": False, "off": False}
+number_pattern = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+class YamlError(Exception):
+    pass
+
+# Fallback for when PyYAML is not installed. Parses the block mappings and sequences, flow collections, quoted and plain
+# scalars and comments line by line, which covers anything compiler_flags.yaml needs
+class FlagsYamlParser:
+    def __init__(self, text):
+        self.lines = []
+
+        for number, line in enumerate(text.splitlines(), 1):
+            if '\t' in line[:len(line) - len(line.lstrip())]:
+                raise YamlError(f"line {number}: tabs can not be used for indentation")
+
+            content = self.strip_comment(line, number).rstrip()
+
+            if content.strip() and content.strip() not in ("---", "..."):
+                self.lines.append((len(content) - len(content.lstrip()), content.strip(), number))
+
+        self.index = 0
+
+    def strip_comment(self, line, number):
+        quote = None
+        is_escaped = False
+
+        for position, char in enumerate(line):
+            if quote:
+                # Escaped with a backslash in double quotes and by doubling the quote in single quotes
+                if is_escaped:
+                    is_escaped = False
+                elif char == '\\' and quote == '"':
+                    is_escaped = True
+                elif char == "'" and quote == "'" and line[position + 1:position + 2] == "'":
+                    is_escaped = True
+                elif char == quote:
+                    quote = None
+            elif char in "\"'" and (position == 0 or line[position - 1] in " \t[{,:-"):
+                quote = char
+            elif char == '#' and (position == 0 or line[position - 1] in " \t"):
+                return line[:position]
+
+        if quote:
+            raise YamlError(f"line {number}: unterminated quoted string")
+
+        return line
+
+    def parse(self):
+        if not self.lines:
+            return None
+
+        value = self.parse_block(self.lines[0][0])
+
+        if self.index < len(self.lines):
+            raise YamlError(f"line {self.lines[self.index][2]}: unexpected indentation")
+
+        return value
+
+    def parse_block(self, indent):
+        content = self.lines[self.index][1]
+        if content == "-" or content.startswith("- "):
+            return self.parse_sequence(indent)
+
+        return self.parse_mapping(indent)
+
+    def parse_sequence(self, indent):
+        items = []
+
+        while self.index < len(self.lines):
+            line_indent, content, number = self.lines[self.index]
+            if line_indent != indent or not (content == "-" or content.startswith("- ")):
+                break
+
+            rest = content[1:].lstrip()
+
+            if not rest:
+                self.index += 1
+                items.append(self.parse_nested(indent, number))
+            elif self.split_key(rest, number):
+                # A mapping starting on the same line as the dash continues at the indentation of its first key
+                self.lines[self.index] = (indent + len(content) - len(rest), rest, number)
+                items.append(self.parse_mapping(indent + len(content) - len(rest)))
+            else:
+                self.index += 1
+                items.append(self.parse_value(rest, number))
+
+        return items
+
+    def parse_mapping(self, indent):
+        mapping = {}
+
+        while self.index < len(self.lines):
+            line_indent, content, number = self.lines[self.index]
+            if line_indent < indent:
+                break
+
+            if line_indent > indent:
+                raise YamlError(f"line {number}: unexpected indentation")
+
+            if content == "-" or content.startswith("- "):
+                break
+
+            key_value = self.split_key(content, number)
+            if not key_value:
+                raise YamlError(f"line {number}: expected 'key: value', found '{content}'")
+
+            key, rest = key_value
+            self.index += 1
+
+            if rest:
+                mapping[key] = self.parse_value(rest, number)
+            elif self.index < len(self.lines) and self.lines[self.index][0] == indent and self.lines[self.index][1].startswith("-"):
+                # Sequences can be written at the same indentation as their key
+                mapping[key] = self.parse_sequence(indent)
+            else:
+                mapping[key] = self.parse_nested(indent, number)
+
+        return mapping
+
+    def parse_nested(self, indent, number):
+        if self.index < len(self.lines) and self.lines[self.index][0] > indent:
+            return self.parse_block(self.lines[self.index][0])
+
+        return None
+
+    def split_key(self, content, number):
+        if content[0] in "\"'":
+            end = self.find_quote_end(content, 0, number)
+            key = self.parse_scalar(content[:end + 1], number)
+            rest = content[end + 1:].lstrip()
+
+            if rest == ":" or rest.startswith(": "):
+                return key, rest[1:].strip()
+
+            return None
+
+        if content[0] in "[{":
+            return None
+
+        match = re.match(r'^([^:]+?)\s*:(\s+(.*))?$', content)
+        if not match:
+            return None
+
+        return match.group(1), (match.group(3) or "").strip()
+
+    def find_quote_end(self, text, start, number):
+        quote = text[start]
+        position = start + 1
+
+        while position < len(text):
+            if text[position] == '\\' and quote == '"':
+                position += 2
+                continue
+
+            if text[position] == quote:
+                if quote == "'" and text[position + 1:position + 2] == "'":
+                    position += 2
+                    continue
+
+                return position
+
+            position += 1
+
+        raise YamlError(f"line {number}: unterminated quoted string")
+
+    def parse_value(self, text, number):
+        if text[0] in "|>":
+            raise YamlError(f"line {number}: block scalars are not supported, use a quoted string instead")
+
+        if text[0] in "[{":
+            value, end = self.parse_flow(text, 0, number)
+
+            if text[end:].strip():
+                raise YamlError(f"line {number}: unexpected '{text[end:].strip()}' after '{text[:end]}'")
+
+            return value
+
+        return self.parse_scalar(text, number)
+
+    def parse_flow(self, text, position, number):
+        closing = "]" if text[position] == "[" else "}"
+        collection = [] if closing == "]" else {}
+        position += 1
+
+        while True:
+            while position < len(text) and text[position] == " ":
+                position += 1
+
+            if position >= len(text):
+                raise YamlError(f"line {number}: missing '{closing}'")
+
+            if text[position] == closing:
+                return collection, position + 1
+
+            value, position = self.parse_flow_item(text, position, number)
+
+            if closing == "}":
+                while position < len(text) and text[position] == " ":
+                    position += 1
+
+                if text[position:position + 1] != ":":
+                    raise YamlError(f"line {number}: expected ':' after the key '{value}'")
+
+                position += 1
+                while position < len(text) and text[position] == " ":
+                    position += 1
+
+                collection[value], position = self.parse_flow_item(text, position, number)
+            else:
+                collection.append(value)
+
+            while position < len(text) and text[position] == " ":
+                position += 1
+
+            if position >= len(text):
+                raise YamlError(f"line {number}: missing '{closing}'")
+
+            if text[position] == ",":
+                position += 1
+            elif text[position] != closing:
+                raise YamlError(f"line {number}: expected ',' or '{closing}' in '{text}'")
+
+    def parse_flow_item(self, text, position, number):
+        if text[position] in "[{":
+            return self.parse_flow(text, position, number)
+
+        if text[position] in "\"'":
+            end = self.find_quote_end(text, position, number)
+            return self.parse_scalar(text[position:end + 1], number), end + 1
+
+        match = re.compile(r'[^,\]\}:]*(:(?! |,|\]|\})[^,\]\}:]*)*').match(text, position)
+        return self.parse_scalar(match.group(0).strip(), number), match.end()
+
+    def parse_scalar(self, text, number):
+        if text.startswith('"'):
+            try:
+                return text[1:-1].encode('latin-1', 'backslashreplace').decode('unicode_escape')
+            except UnicodeDecodeError:
+                raise YamlError(f"line {number}: invalid escape sequence in {text}")
+
+        if text.startswith("'"):
+            return text[1:-1].replace("''", "'")
+
+        if text.lower() in bool_values:
+            return bool_values[text.lower()]
+
+        if text in ("", "~") or text.lower() == "null":
+            return None
 
-        current_flag = None
+        if number_pattern.match(text):
+            return float(text) if any(char in text for char in ".eE") else int(text)
 
-cmake_flags = ";".join(flags).strip()
-print(cmake_flags)"""
+        return text
+
+def load_yaml(text):
+    try:
+        import yaml
+    except ImportError:
+        return FlagsYamlParser(text).parse()
+
+    # The C accelerated loader is much faster on large files, but it is only available if PyYAML was built with libyaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    try:
+        return yaml.load(text, Loader = loader)
+    except yaml.YAMLError as e:
+        raise YamlError(str(e))
+
+def describe(value):
+    return "nothing" if value is None else f"'{value}'"
+
+# Checks the structure of the file and collects the entries of every compiler and section (build type or profile)
+# as (flag, enabled, tags), failing on anything that does not fit instead of silently dropping flags
+def parse_flags(document):
+    flags = {(compiler, section): [] for compiler in compilers for section in build_types + profiles}
+
+    if not isinstance(document, dict):
+        fail("compiler_flags.yaml: expected a mapping of compilers at the top level")
+
+    for compiler_key, sections in document.items():
+        compiler = str(compiler_key).lower()
+        if compiler not in compilers:
+            continue
+
+        if sections is None:
+            continue
+
+        if not isinstance(sections, dict):
+            fail(f"compiler_flags.yaml: {compiler_key}: expected a mapping of build types and profiles, found {describe(sections)}")
+
+        for section_key, entries in sections.items():
+            section = str(section_key).lower()
+            location = f"{compiler_key}.{section_key}"
+
+            if section not in build_types + profiles:
+                fail(f"compiler_flags.yaml: {location}: unknown section, expected one of: {', '.join(build_types + profiles)}")
+
+            if entries is None:
+                continue
+
+            if not isinstance(entries, list):
+                fail(f"compiler_flags.yaml: {location}: expected a list of flag entries, found {describe(entries)}")
+
+            for index, entry in enumerate(entries):
+                entry_location = f"{location}[{index}]"
+
+                if not isinstance(entry, dict):
+                    fail(f"compiler_flags.yaml: {entry_location}: expected a flag entry with 'flag' and 'enabled' keys, found {describe(entry)}")
+
+                for key in entry:
+                    if key not in entry_keys:
+                        fail(f"compiler_flags.yaml: {entry_location}: unknown key '{key}', expected one of: {', '.join(entry_keys)}")
+
+                flag = entry.get("flag")
+                if not isinstance(flag, str) or not flag.strip():
+                    fail(f"compiler_flags.yaml: {entry_location}: 'flag' must be a non-empty string, found {describe(flag)}")
+
+                enabled = entry.get("enabled")
+                if not isinstance(enabled, bool):
+                    fail(f"compiler_flags.yaml: {entry_location} ({flag}): 'enabled' must be true or false, found {describe(enabled)}")
+
+                tags = entry.get("tags") or []
+                if isinstance(tags, str):
+                    tags = [tags]
+
+                if not isinstance(tags, list) or not all(isinstance(tag, str) and tag.strip() for tag in tags):
+                    fail(f"compiler_flags.yaml: {entry_location} ({flag}): 'tags' must be a list of names, found {describe(tags)}")
+
+                flags[(compiler, section)].append((flag.strip(), enabled, [tag.strip().lower() for tag in tags]))
+
+    return flags
+
+term_pattern = re.compile(r'^([+-]?)([a-z0-9_-]+)$')
+
+def parse_profile(profile, flags):
+    known_names = set(profiles)
+    known_names.update(tag for entries in flags.values() for _, _, tags in entries for tag in tags)
+    terms = []
+
+    for term in profile.split():
+        term_match = term_pattern.match(term)
+        if not term_match:
+            fail(f"Invalid term '{term}' in the profile expression '{profile}', expected +name or -name")
+
+        if term_match.group(2) not in known_names:
+            fail(f"Unknown profile or tag '{term_match.group(2)}', expected one of: {', '.join(sorted(known_names))}")
+
+        terms.append((term_match.group(1) != "-", term_match.group(2)))
+
+    return terms
+
+# Starts from the enabled flags of each build type and applies the terms in order. +name adds the enabled entries of the
+# profile and every entry tagged with the name whether it is enabled or not, -name removes them. Profiles skip debug builds.
+# The flags keep the order they were added in and appear only once
+def compose_flags(flags, terms):
+    build_flags = {}
+
+    for compiler in compilers:
+        for build_type in build_types:
+            sections = [build_type] if build_type == "debug" else [build_type] + profiles
+            selected = dict.fromkeys(flag for flag, enabled, _ in flags[(compiler, build_type)] if enabled)
+
+            for is_added, name in terms:
+                matched = [flag for section in sections for flag, enabled, tags in flags[(compiler, section)]
+                           if name in tags or (section == name and enabled)]
+
+                for flag in matched:
+                    if is_added:
+                        selected.setdefault(flag)
+                    else:
+                        selected.pop(flag, None)
+
+            build_flags[(compiler, build_type)] = list(selected)
+
+    return build_flags
+
+def escape_cmake(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('$', '\\$')
+
+try:
+    document = load_yaml(file_content)
+except YamlError as e:
+    fail(f"compiler_flags.yaml is not valid YAML:\n {e}")
+
+entries = parse_flags(document)
+flags = compose_flags(entries, parse_profile(profile, entries))
+
+if args[0] != "--cmake":
+    target_compiler = args[0].lower()
+    target_build_type = args[1].lower()
+
+    if (target_compiler, target_build_type) not in flags:
+        fail(f"Unknown compiler or build type '{args[0]} {args[1]}', expected one of: {', '.join(compilers)} and {', '.join(build_types)}")
+
+    print(";".join(flags[(target_compiler, target_build_type)]))
+    sys.exit(0)
+
+# Write the flags of every compiler and build type as a CMake script keyed on the hash of
+# compiler_flags.yaml and the profile so that CMake can include it directly until either of them changes
+output_file = args[1]
+os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok = True)
+temp_file = f"{output_file}.tmp"
+
+with open(temp_file, 'w', encoding = 'utf-8') as file:
+    file.write(f'set(CACHED_FLAGS_HASH "{file_hash}")\n')
+    file.write(f'set(CACHED_FLAGS_PROFILE "{escape_cmake(profile)}")\n')
+
+    for (compiler, build_type), build_flags in flags.items():
+        cmake_flags = escape_cmake(";".join(build_flags))
+        file.write(f'set(FLAGS_{compiler.upper()}_{build_type.upper()} "{cmake_flags}")\n')
+
+os.replace(temp_file, output_file)"""
 
     functions_cmake = r"""# This file was generated by Xen ProjGen.
 # File: functions.cmake
@@ -425,7 +1026,14 @@ function (append_os_definitions OUT_DEFINITIONS)
 endfunction()
 
 function (append_build_definitions OUT_DEFINITIONS)
-    if ("${CMAKE_BUILD_TYPE}" STREQUAL "Debug")
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+
+    if (IS_MULTI_CONFIG)
+        list(APPEND ${OUT_DEFINITIONS} "$<$<CONFIG:Debug>:DEBUG>")
+        list(APPEND ${OUT_DEFINITIONS} "$<$<CONFIG:Release>:RELEASE>")
+        list(APPEND ${OUT_DEFINITIONS} "$<$<CONFIG:MinSizeRel>:MINSIZEREL>")
+        list(APPEND ${OUT_DEFINITIONS} "$<$<CONFIG:RelWithDebInfo>:RELWITHDEBINFO>")
+    elseif ("${CMAKE_BUILD_TYPE}" STREQUAL "Debug")
         list(APPEND ${OUT_DEFINITIONS} "DEBUG")
     elseif ("${CMAKE_BUILD_TYPE}" STREQUAL "Release")
         list(APPEND ${OUT_DEFINITIONS} "RELEASE")
@@ -446,108 +1054,1062 @@ function(read_file FILE_PATH OUT_CONTENTS)
 endfunction()
 
 function (get_compiler_flags COMPILER_VARIANT OUT_FLAGS)
-    find_package (Python COMPONENTS Interpreter Development)
+    set(FLAGS_YAML "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}config/compiler_flags.yaml")
+    set(FLAGS_CACHE "${CMAKE_BINARY_DIR}/flags/compiler_flags.cmake")
 
-    if (NOT PYTHON_FOUND)
-        message(FATAL_ERROR "Python not found.")
+    set(FLAGS_PARSER "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils/flags.cmake")
+
+    # The flags of every build type are composed from the profiles and tags of compiler_flags.yaml, e.g. -DCOMPILER_FLAGS_PROFILE="+perf -warnings"
+    set(COMPILER_FLAGS_PROFILE "" CACHE STRING "Profile expression composing the flags of compiler_flags.yaml (e.g. +perf -warnings)")
+    string(TOLOWER "${COMPILER_FLAGS_PROFILE}" FLAGS_PROFILE)
+
+    # Reconfigure automatically whenever compiler_flags.yaml changes
+    set_property(DIRECTORY APPEND PROPERTY CMAKE_CONFIGURE_DEPENDS "${FLAGS_YAML}")
+
+    if (EXISTS "${FLAGS_PARSER}")
+        # Parse compiler_flags.yaml directly in CMake, no Python needed
+        include("${FLAGS_PARSER}")
+        parse_compiler_flags("${FLAGS_YAML}" "${FLAGS_PROFILE}")
+    else()
+        file(MD5 "${FLAGS_YAML}" FLAGS_YAML_HASH)
+
+        set(CACHED_FLAGS_HASH "")
+        set(CACHED_FLAGS_PROFILE "")
+        if (EXISTS "${FLAGS_CACHE}")
+            include("${FLAGS_CACHE}")
+        endif()
+
+        # Only run fetch_flags.py if the cached flags were resolved from a different compiler_flags.yaml or profile
+        if (NOT "${CACHED_FLAGS_HASH}" STREQUAL "${FLAGS_YAML_HASH}" OR NOT "${CACHED_FLAGS_PROFILE}" STREQUAL "${FLAGS_PROFILE}")
+            find_package (Python COMPONENTS Interpreter)
+
+            if (NOT PYTHON_FOUND)
+                message(FATAL_ERROR "Python not found.")
+            endif()
+
+            set(PROFILE_ARGS "")
+            if (NOT "${FLAGS_PROFILE}" STREQUAL "")
+                set(PROFILE_ARGS --profile "${FLAGS_PROFILE}")
+            endif()
+
+            execute_process(
+                COMMAND "${Python_EXECUTABLE}" "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils/fetch_flags.py" --cmake "${FLAGS_CACHE}" ${PROFILE_ARGS}
+                ERROR_VARIABLE ERROR_MSG
+                RESULT_VARIABLE RESULT
+                WORKING_DIRECTORY "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils"
+            )
+
+            if (NOT RESULT EQUAL 0)
+                message(FATAL_ERROR "Error in fetch_flags.py:\n${ERROR_MSG}")
+            endif()
+
+            include("${FLAGS_CACHE}")
+        endif()
+    endif()
+
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+
+    if (ARGC GREATER 2)
+        # Use the flags of the given build type in every configuration
+        string(TOUPPER "FLAGS_${COMPILER_VARIANT}_${ARGV2}" CONFIG_FLAGS)
+        set(FLAGS ${${CONFIG_FLAGS}})
+    elseif (IS_MULTI_CONFIG)
+        # Select the flags of each configuration at build time
+        set(FLAGS "")
+        foreach (CONFIG ${CMAKE_CONFIGURATION_TYPES})
+            string(TOUPPER "FLAGS_${COMPILER_VARIANT}_${CONFIG}" CONFIG_FLAGS)
+
+            foreach (FLAG ${${CONFIG_FLAGS}})
+                string(REPLACE ">" "$<ANGLE-R>" FLAG "${FLAG}")
+                string(REPLACE "," "$<COMMA>" FLAG "${FLAG}")
+                list(APPEND FLAGS "$<$<CONFIG:${CONFIG}>:${FLAG}>")
+            endforeach()
+        endforeach()
+    else()
+        string(TOUPPER "FLAGS_${COMPILER_VARIANT}_${CMAKE_BUILD_TYPE}" CONFIG_FLAGS)
+        set(FLAGS ${${CONFIG_FLAGS}})
     endif()
 
-    execute_process(
-        COMMAND "${Python_EXECUTABLE}" "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils/fetch_flags.py" ${COMPILER_VARIANT} ${CMAKE_BUILD_TYPE}
-        OUTPUT_VARIABLE TEMP
-        ERROR_VARIABLE ERROR_MSG
-        RESULT_VARIABLE RESULT
-        WORKING_DIRECTORY "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils"
-    )
+    set(${OUT_FLAGS} ${FLAGS} PARENT_SCOPE)
+endfunction()
+
+function (setup_compiler_cache CACHE_DIR)
+    # Prefers ccache over sccache, pass -DCOMPILER_CACHE_PROGRAM=<path> to pick one explicitly
+    find_program(COMPILER_CACHE_PROGRAM NAMES ccache sccache)
+
+    if (NOT COMPILER_CACHE_PROGRAM)
+        message(STATUS "No compiler cache (ccache or sccache) found, compiling without one")
+        return()
+    endif()
+
+    get_filename_component(CACHE_NAME "${COMPILER_CACHE_PROGRAM}" NAME_WE)
+    string(TOUPPER "${CACHE_NAME}" CACHE_NAME)
+    set(LAUNCHER "${COMPILER_CACHE_PROGRAM}")
 
-    if (NOT RESULT EQUAL 0)
-        message(FATAL_ERROR "Error in fetch_flags.py:\n${ERROR_MSG}")
+    if (CACHE_DIR)
+        set(LAUNCHER "${CMAKE_COMMAND}" -E env "${CACHE_NAME}_DIR=${CACHE_DIR}" "${COMPILER_CACHE_PROGRAM}")
     endif()
 
-    string(STRIP "${TEMP}" TEMP_CLEAN)
-    set(${OUT_FLAGS} ${TEMP_CLEAN} PARENT_SCOPE)
+    message(STATUS "Using compiler cache: ${COMPILER_CACHE_PROGRAM}")
+    set(COMPILER_CACHE_LAUNCHER "${LAUNCHER}" PARENT_SCOPE)
+    set(CMAKE_C_COMPILER_LAUNCHER "${LAUNCHER}" PARENT_SCOPE)
+    set(CMAKE_CXX_COMPILER_LAUNCHER "${LAUNCHER}" PARENT_SCOPE)
 endfunction()
 
-function(install_dy_libs TARGET_NAME OUT_DIR DY_LIBS)
-    foreach(DY_LIB ${DY_LIBS})
-        add_custom_command(TARGET "${TARGET_NAME}" POST_BUILD
-            COMMAND ${CMAKE_COMMAND} -E copy_if_different "${DY_LIB}" "${OUT_DIR}")
+function (add_compiler_cache_stats)
+    if (NOT COMPILER_CACHE_LAUNCHER)
+        return()
+    endif()
+
+    # Runs after the given targets on every build and prints the hit statistics of the compiler cache
+    add_custom_target(compiler_cache_stats ALL
+        COMMAND ${COMPILER_CACHE_LAUNCHER} --show-stats
+        COMMENT "Compiler cache statistics"
+        VERBATIM)
+
+    foreach (TARGET_NAME ${ARGN})
+        if (TARGET "${TARGET_NAME}")
+            add_dependencies(compiler_cache_stats "${TARGET_NAME}")
+        endif()
     endforeach()
 endfunction()
 
-function(add_exec_target TARGET_NAME SOURCE HEADERS INCLUDE_DIRS LINK_LIBS DY_LIBS DEFS FLAGS FEATURES LINKER_FLAGS IS_TEST)
-    if (NOT SOURCE)
+function (get_source_languages TARGET_NAME OUT_LANGUAGES)
+    set(LANGUAGES "")
+    get_target_property(SOURCES "${TARGET_NAME}" SOURCES)
+
+    foreach (SOURCE ${SOURCES})
+        get_filename_component(EXTENSION "${SOURCE}" LAST_EXT)
+        string(SUBSTRING "${EXTENSION}" 1 -1 EXTENSION)
+
+        foreach (LANGUAGE C CXX)
+            if ("${EXTENSION}" IN_LIST CMAKE_${LANGUAGE}_SOURCE_FILE_EXTENSIONS)
+                list(APPEND LANGUAGES "${LANGUAGE}")
+            endif()
+        endforeach()
+    endforeach()
+
+    list(REMOVE_DUPLICATES LANGUAGES)
+    set(${OUT_LANGUAGES} "${LANGUAGES}" PARENT_SCOPE)
+endfunction()
+
+function (add_precompiled_headers TARGET_NAME HEADERS REUSE_FROM_TARGET)
+    if (NOT TARGET "${TARGET_NAME}" OR NOT HEADERS)
         return()
     endif()
 
-    if (IS_TEST)
-        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/test")
-    else()
-        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/bin")
+    if (CMAKE_VERSION VERSION_LESS 3.16)
+        message(WARNING "Precompiled headers require CMake 3.16 or newer, compiling ${TARGET_NAME} without them.")
+        return()
     endif()
 
-    if ("${CMAKE_BUILD_TYPE}" STREQUAL "Debug")
-        set(OUT_DIR "${OUT_DIR}/Debug")
-    else()
-        set(OUT_DIR "${OUT_DIR}/Release")
+    # Reusing requires both targets to be compiled with the same flags, definitions and language standards,
+    # and the reused target to have precompiled headers for every language of the target
+    set(CAN_REUSE FALSE)
+    if (REUSE_FROM_TARGET AND TARGET "${REUSE_FROM_TARGET}")
+        get_source_languages("${TARGET_NAME}" LANGUAGES)
+        get_source_languages("${REUSE_FROM_TARGET}" REUSE_FROM_LANGUAGES)
+        set(CAN_REUSE TRUE)
+
+        foreach (LANGUAGE ${LANGUAGES})
+            if (NOT "${LANGUAGE}" IN_LIST REUSE_FROM_LANGUAGES)
+                set(CAN_REUSE FALSE)
+            endif()
+        endforeach()
     endif()
 
-    add_executable("${TARGET_NAME}" ${SOURCE} ${HEADERS})
-    target_include_directories("${TARGET_NAME}" PRIVATE ${INCLUDE_DIRS})
-    target_link_libraries("${TARGET_NAME}" PRIVATE ${LINK_LIBS})
-    target_compile_definitions("${TARGET_NAME}" PRIVATE ${DEFS})
-    target_compile_options("${TARGET_NAME}" PRIVATE ${FLAGS})
-    target_compile_features("${TARGET_NAME}" PRIVATE ${FEATURES})
-    target_link_options("${TARGET_NAME}" PRIVATE ${LINKER_FLAGS})
-    set_target_properties("${TARGET_NAME}" PROPERTIES RUNTIME_OUTPUT_DIRECTORY "${OUT_DIR}")
-    install_dy_libs("${TARGET_NAME}" "${OUT_DIR}" "${DY_LIBS}")
+    if (CAN_REUSE)
+        target_precompile_headers("${TARGET_NAME}" REUSE_FROM "${REUSE_FROM_TARGET}")
+    else()
+        target_precompile_headers("${TARGET_NAME}" PRIVATE ${HEADERS})
+    endif()
 endfunction()
 
-function(add_lib_target TARGET_NAME SOURCE HEADERS INCLUDE_DIRS LINK_LIBS DY_LIBS DEFS FLAGS FEATURES LINKER_FLAGS IS_SHARED)
-    if (NOT SOURCE)
+function (enable_unity_build TARGET_NAME BATCH_SIZE EXCLUDED_SOURCES)
+    if (NOT TARGET "${TARGET_NAME}")
         return()
     endif()
 
-    if ("${CMAKE_BUILD_TYPE}" STREQUAL "Debug")
-        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/lib/Debug")
-    else()
-        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/lib/Release")
+    if (CMAKE_VERSION VERSION_LESS 3.16)
+        message(WARNING "Unity builds require CMake 3.16 or newer, compiling ${TARGET_NAME} without them.")
+        return()
     endif()
 
-    if (IS_SHARED)
-        add_library("${TARGET_NAME}" SHARED ${SOURCE} ${HEADERS})
-    else()
-        add_library("${TARGET_NAME}" STATIC ${SOURCE} ${HEADERS})
-    endif()
-    
-    target_include_directories("${TARGET_NAME}" PUBLIC ${INCLUDE_DIRS})
-    target_link_libraries("${TARGET_NAME}" PUBLIC ${LINK_LIBS})
-    target_compile_definitions("${TARGET_NAME}" PUBLIC ${DEFS})
-    target_compile_options("${TARGET_NAME}" PUBLIC ${FLAGS})
-    target_compile_features("${TARGET_NAME}" PUBLIC ${FEATURES})
-    target_link_options("${TARGET_NAME}" PUBLIC ${LINKER_FLAGS})
-    
     set_target_properties("${TARGET_NAME}" PROPERTIES
-        RUNTIME_OUTPUT_DIRECTORY "${OUT_DIR}"
-        LIBRARY_OUTPUT_DIRECTORY "${OUT_DIR}"
-        ARCHIVE_OUTPUT_DIRECTORY "${OUT_DIR}")
+        UNITY_BUILD ON
+        UNITY_BUILD_BATCH_SIZE "${BATCH_SIZE}")
 
-    install_dy_libs("${TARGET_NAME}" "${OUT_DIR}" "${DY_LIBS}")
-endfunction()"""
+    # Excluded sources are paths or wildcards relative to the project root, compiled on their own
+    foreach (PATTERN ${EXCLUDED_SOURCES})
+        file(GLOB EXCLUDED_FILES "${CMAKE_SOURCE_DIR}/${PATTERN}")
 
-    proj_or_empty = 'project/' if conf.has_proj_dir else ''
-    build_or_empty = 'build/' if conf.is_out_in_build_dir else ''
+        if (EXCLUDED_FILES)
+            set_source_files_properties(${EXCLUDED_FILES} PROPERTIES SKIP_UNITY_BUILD_INCLUSION ON)
+        endif()
+    endforeach()
+endfunction()
 
-    functions_cmake = functions_cmake.replace('{[(PROJ_OR_EMPTY)]}', proj_or_empty)
-    functions_cmake = functions_cmake.replace('{[(BUILD_OR_EMPTY)]}', build_or_empty)
+function (enable_link_time_optimization)
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+
+    if (NOT IS_MULTI_CONFIG AND ("${CMAKE_BUILD_TYPE}" STREQUAL "Debug" OR "${CMAKE_BUILD_TYPE}" STREQUAL ""))
+        message(STATUS "Link-time optimization: not used for ${CMAKE_BUILD_TYPE} builds")
+        return()
+    endif()
+
+    # Checking requires building a test project, so the result is cached
+    if (NOT DEFINED CACHE{LTO_SUPPORTED})
+        include(CheckIPOSupported)
+        check_ipo_supported(RESULT IPO_SUPPORTED OUTPUT IPO_ERROR)
+        set(LTO_SUPPORTED "${IPO_SUPPORTED}" CACHE INTERNAL "Whether the toolchain supports link-time optimization")
+    endif()
+
+    if (NOT LTO_SUPPORTED)
+        message(STATUS "Link-time optimization: not supported by the toolchain, building without it")
+        return()
+    endif()
+
+    # CMake already uses ThinLTO on Clang, which links much faster with nearly the same results
+    if ("${CMAKE_C_COMPILE_OPTIONS_IPO};${CMAKE_CXX_COMPILE_OPTIONS_IPO}" MATCHES "-flto=thin")
+        set(LTO_MODE "ThinLTO")
+    else()
+        set(LTO_MODE "LTO")
+    endif()
+
+    foreach (TARGET_NAME ${ARGN})
+        if (TARGET "${TARGET_NAME}")
+            set_target_properties("${TARGET_NAME}" PROPERTIES
+                INTERPROCEDURAL_OPTIMIZATION_RELEASE ON
+                INTERPROCEDURAL_OPTIMIZATION_RELWITHDEBINFO ON
+                INTERPROCEDURAL_OPTIMIZATION_MINSIZEREL ON)
+        endif()
+    endforeach()
+
+    message(STATUS "Link-time optimization: ${LTO_MODE} enabled for Release, RelWithDebInfo and MinSizeRel builds")
+endfunction()
+
+function (add_pgo_configurations)
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+
+    if (IS_MULTI_CONFIG)
+        set(CONFIGURATION_TYPES ${CMAKE_CONFIGURATION_TYPES} PgoGenerate PgoUse)
+        list(REMOVE_DUPLICATES CONFIGURATION_TYPES)
+        set(CMAKE_CONFIGURATION_TYPES "${CONFIGURATION_TYPES}" PARENT_SCOPE)
+    endif()
+
+    set(OWN_OUT_DIR_CONFIGS ${OWN_OUT_DIR_CONFIGS} PgoGenerate PgoUse PARENT_SCOPE)
+endfunction()
+
+# Only the sanitizers the compiler supports are added, GCC has no memory sanitizer and MSVC only has the address sanitizer
+function (add_sanitizer_configurations)
+    get_compiler_definition(COMPILER_DEFINITION)
+
+    if ("${COMPILER_DEFINITION}" STREQUAL "CLANG_COMPILER")
+        set(SANITIZER_CONFIGS Asan Tsan Ubsan Msan)
+    elseif ("${COMPILER_DEFINITION}" STREQUAL "GCC_COMPILER")
+        set(SANITIZER_CONFIGS Asan Tsan Ubsan)
+    elseif ("${COMPILER_DEFINITION}" STREQUAL "MSVC_COMPILER" OR "${COMPILER_DEFINITION}" STREQUAL "CLANG_CL_COMPILER")
+        set(SANITIZER_CONFIGS Asan)
+    else()
+        message(WARNING "Sanitizer builds are not supported for ${COMPILER_DEFINITION}, no sanitizer build types were added.")
+        return()
+    endif()
+
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+
+    if (IS_MULTI_CONFIG)
+        set(CONFIGURATION_TYPES ${CMAKE_CONFIGURATION_TYPES} ${SANITIZER_CONFIGS})
+        list(REMOVE_DUPLICATES CONFIGURATION_TYPES)
+        set(CMAKE_CONFIGURATION_TYPES "${CONFIGURATION_TYPES}" PARENT_SCOPE)
+    else()
+        # Building an unsupported sanitizer would silently produce an uninstrumented binary
+        string(TOUPPER "${CMAKE_BUILD_TYPE}" BUILD_TYPE)
+        string(TOUPPER "${SANITIZER_CONFIGS}" SUPPORTED_CONFIGS)
+
+        if (BUILD_TYPE MATCHES "^(ASAN|TSAN|UBSAN|MSAN)$" AND NOT "${BUILD_TYPE}" IN_LIST SUPPORTED_CONFIGS)
+            string(REPLACE ";" ", " SANITIZER_CONFIGS "${SANITIZER_CONFIGS}")
+            message(FATAL_ERROR "The ${CMAKE_BUILD_TYPE} build type is not supported by ${COMPILER_DEFINITION}, expected one of: ${SANITIZER_CONFIGS}")
+        endif()
+    endif()
+
+    set(OWN_OUT_DIR_CONFIGS ${OWN_OUT_DIR_CONFIGS} ${SANITIZER_CONFIGS} PARENT_SCOPE)
+    string(REPLACE ";" ", " SANITIZER_CONFIGS "${SANITIZER_CONFIGS}")
+    message(STATUS "Sanitizers: ${SANITIZER_CONFIGS} builds available")
+endfunction()
+
+function (enable_profile_guided_optimization TARGET_NAME PROFILE_DIR)
+    if (NOT TARGET "${TARGET_NAME}")
+        return()
+    endif()
+
+    get_compiler_definition(COMPILER_DEFINITION)
+    get_property(IS_MULTI_CONFIG GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+    set(MERGE_COMMAND "")
+
+    if (CMAKE_CXX_COMPILER_VERSION)
+        set(COMPILER_VERSION "${CMAKE_CXX_COMPILER_VERSION}")
+    else()
+        set(COMPILER_VERSION "${CMAKE_C_COMPILER_VERSION}")
+    endif()
+
+    if ("${COMPILER_DEFINITION}" STREQUAL "GCC_COMPILER")
+        set(GENERATE_FLAGS "-fprofile-generate=${PROFILE_DIR}" "-fprofile-update=prefer-atomic")
+        set(USE_FLAGS "-fprofile-use=${PROFILE_DIR}" "-fprofile-partial-training" "-Wno-missing-profile")
+        set(GENERATE_LINK_FLAGS "-fprofile-generate=${PROFILE_DIR}")
+        set(USE_LINK_FLAGS "")
+
+        # The profiles are named after the object files, stripping their build directory lets another build directory use them
+        if (COMPILER_VERSION VERSION_GREATER_EQUAL 11)
+            if (IS_MULTI_CONFIG)
+                set(PREFIX_PATH "${CMAKE_BINARY_DIR}/CMakeFiles/${TARGET_NAME}.dir/$<CONFIG>")
+            else()
+                set(PREFIX_PATH "${CMAKE_BINARY_DIR}")
+            endif()
+
+            list(APPEND GENERATE_FLAGS "-fprofile-prefix-path=${PREFIX_PATH}")
+            list(APPEND USE_FLAGS "-fprofile-prefix-path=${PREFIX_PATH}")
+        endif()
+    elseif ("${COMPILER_DEFINITION}" STREQUAL "CLANG_COMPILER")
+        set(RAW_PROFILE "${PROFILE_DIR}/${TARGET_NAME}.profraw")
+        set(MERGED_PROFILE "${PROFILE_DIR}/${TARGET_NAME}.profdata")
+        set(GENERATE_FLAGS "-fprofile-instr-generate=${RAW_PROFILE}")
+        set(USE_FLAGS "-fprofile-instr-use=${MERGED_PROFILE}" "-Wno-profile-instr-unprofiled" "-Wno-profile-instr-out-of-date")
+        set(GENERATE_LINK_FLAGS "-fprofile-instr-generate=${RAW_PROFILE}")
+        set(USE_LINK_FLAGS "")
+
+        # The raw profile has to be merged before Clang can use it
+        get_filename_component(COMPILER_DIR "${CMAKE_CXX_COMPILER}${CMAKE_C_COMPILER}" DIRECTORY)
+        string(REGEX MATCH "^[0-9]+" COMPILER_MAJOR_VERSION "${COMPILER_VERSION}")
+        find_program(LLVM_PROFDATA NAMES llvm-profdata "llvm-profdata-${COMPILER_MAJOR_VERSION}" HINTS "${COMPILER_DIR}")
+
+        if (NOT LLVM_PROFDATA)
+            message(WARNING "llvm-profdata not found, pass -DLLVM_PROFDATA=<path> to merge the profile of ${TARGET_NAME}.")
+        else()
+            set(MERGE_COMMAND COMMAND "${LLVM_PROFDATA}" merge "-output=${MERGED_PROFILE}" "${RAW_PROFILE}")
+        endif()
+    elseif ("${COMPILER_DEFINITION}" STREQUAL "MSVC_COMPILER")
+        # The linker merges the .pgc files of the training run into the .pgd file on its own
+        set(PGD_FILE "${PROFILE_DIR}/${TARGET_NAME}.pgd")
+        set(GENERATE_FLAGS "/GL")
+        set(USE_FLAGS "/GL")
+        set(GENERATE_LINK_FLAGS "/LTCG" "/GENPROFILE:PGD=${PGD_FILE}")
+        set(USE_LINK_FLAGS "/LTCG" "/USEPROFILE:PGD=${PGD_FILE}")
+    else()
+        message(WARNING "Profile-guided optimization is not supported for ${COMPILER_DEFINITION}, building ${TARGET_NAME} without it.")
+        return()
+    endif()
+
+    file(MAKE_DIRECTORY "${PROFILE_DIR}")
+
+    target_compile_options("${TARGET_NAME}" PRIVATE
+        "$<$<CONFIG:PgoGenerate>:${GENERATE_FLAGS}>"
+        "$<$<CONFIG:PgoUse>:${USE_FLAGS}>")
+
+    target_link_options("${TARGET_NAME}" PRIVATE
+        "$<$<CONFIG:PgoGenerate>:${GENERATE_LINK_FLAGS}>"
+        "$<$<CONFIG:PgoUse>:${USE_LINK_FLAGS}>")
+
+    # Runs the instrumented binary from its output directory to record the profile, build it with the PgoGenerate configuration
+    set(PGO_TRAINING_ARGS "" CACHE STRING "Command line arguments passed to the target by the PGO training run")
+    separate_arguments(TRAINING_ARGS NATIVE_COMMAND "${PGO_TRAINING_ARGS}")
+
+    add_custom_target(pgo_train
+        COMMAND "$<TARGET_FILE:${TARGET_NAME}>" ${TRAINING_ARGS}
+        ${MERGE_COMMAND}
+        WORKING_DIRECTORY "$<TARGET_FILE_DIR:${TARGET_NAME}>"
+        COMMENT "Recording the profile of ${TARGET_NAME} for profile-guided optimization"
+        VERBATIM)
+
+    add_dependencies(pgo_train "${TARGET_NAME}")
+    message(STATUS "Profile-guided optimization: PgoGenerate and PgoUse builds available, profile directory is ${PROFILE_DIR}")
+endfunction()
+
+function(install_dy_libs TARGET_NAME OUT_DIR DY_LIBS)
+    foreach(DY_LIB ${DY_LIBS})
+        add_custom_command(TARGET "${TARGET_NAME}" POST_BUILD
+            COMMAND ${CMAKE_COMMAND} -E copy_if_different "${DY_LIB}" "${OUT_DIR}")
+    endforeach()
+endfunction()
+
+# Builds of these configurations get their own output directory, the rest share the Release one
+set(OWN_OUT_DIR_CONFIGS "Debug")
+
+function (get_config_out_dir OUT_CONFIG_DIR)
+    set(CONFIG_DIR "")
+    set(IS_OWN_CONFIG "")
+
+    foreach (CONFIG ${OWN_OUT_DIR_CONFIGS})
+        string(APPEND CONFIG_DIR "$<$<CONFIG:${CONFIG}>:${CONFIG}>")
+        list(APPEND IS_OWN_CONFIG "$<CONFIG:${CONFIG}>")
+    endforeach()
+
+    string(REPLACE ";" "," IS_OWN_CONFIG "${IS_OWN_CONFIG}")
+    set(${OUT_CONFIG_DIR} "${CONFIG_DIR}$<$<NOT:$<OR:${IS_OWN_CONFIG}>>:Release>" PARENT_SCOPE)
+endfunction()
+
+function(add_exec_target TARGET_NAME SOURCE HEADERS INCLUDE_DIRS LINK_LIBS DY_LIBS DEFS FLAGS FEATURES LINKER_FLAGS IS_TEST)
+    if (NOT SOURCE)
+        return()
+    endif()
+
+    # An optional output directory name can be passed after IS_TEST, e.g. "bench" for out/bench
+    if (ARGC GREATER 11)
+        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/${ARGV11}")
+    elseif (IS_TEST)
+        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/test")
+    else()
+        set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/bin")
+    endif()
+
+    # Evaluated per configuration, which also stops multi-config generators from appending their own subdirectory
+    get_config_out_dir(CONFIG_DIR)
+    set(OUT_DIR "${OUT_DIR}/${CONFIG_DIR}")
+
+    add_executable("${TARGET_NAME}" ${SOURCE} ${HEADERS})
+    target_include_directories("${TARGET_NAME}" PRIVATE ${INCLUDE_DIRS})
+    target_link_libraries("${TARGET_NAME}" PRIVATE ${LINK_LIBS})
+    target_compile_definitions("${TARGET_NAME}" PRIVATE ${DEFS})
+    target_compile_options("${TARGET_NAME}" PRIVATE ${FLAGS})
+    target_compile_features("${TARGET_NAME}" PRIVATE ${FEATURES})
+    get_sanitizer_link_flags("${FLAGS}" SANITIZER_LINK_FLAGS)
+    target_link_options("${TARGET_NAME}" PRIVATE ${LINKER_FLAGS} ${SANITIZER_LINK_FLAGS})
+    set_target_properties("${TARGET_NAME}" PROPERTIES RUNTIME_OUTPUT_DIRECTORY "${OUT_DIR}")
+    install_dy_libs("${TARGET_NAME}" "${OUT_DIR}" "${DY_LIBS}")
+endfunction()
+
+# The sanitizers of GCC and Clang have to be linked as well, MSVC links their runtime by itself
+function (get_sanitizer_link_flags FLAGS OUT_FLAGS)
+    set(LINK_FLAGS "")
+
+    foreach (FLAG ${FLAGS})
+        # Also matches the flags wrapped in a generator expression per configuration
+        if (FLAG MATCHES "(^|:)-fsanitize=")
+            list(APPEND LINK_FLAGS "${FLAG}")
+        endif()
+    endforeach()
+
+    set(${OUT_FLAGS} ${LINK_FLAGS} PARENT_SCOPE)
+endfunction()
+
+function(add_lib_target TARGET_NAME SOURCE HEADERS INCLUDE_DIRS LINK_LIBS DY_LIBS DEFS FLAGS FEATURES LINKER_FLAGS IS_SHARED)
+    if (NOT SOURCE)
+        return()
+    endif()
+
+    get_config_out_dir(CONFIG_DIR)
+    set(OUT_DIR "${CMAKE_SOURCE_DIR}/{[(BUILD_OR_EMPTY)]}out/lib/${CONFIG_DIR}")
+
+    if (IS_SHARED)
+        add_library("${TARGET_NAME}" SHARED ${SOURCE} ${HEADERS})
+    else()
+        add_library("${TARGET_NAME}" STATIC ${SOURCE} ${HEADERS})
+    endif()
+    
+    target_include_directories("${TARGET_NAME}" PUBLIC ${INCLUDE_DIRS})
+    target_link_libraries("${TARGET_NAME}" PUBLIC ${LINK_LIBS})
+    target_compile_definitions("${TARGET_NAME}" PUBLIC ${DEFS})
+    target_compile_options("${TARGET_NAME}" PUBLIC ${FLAGS})
+    target_compile_features("${TARGET_NAME}" PUBLIC ${FEATURES})
+    get_sanitizer_link_flags("${FLAGS}" SANITIZER_LINK_FLAGS)
+    target_link_options("${TARGET_NAME}" PUBLIC ${LINKER_FLAGS} ${SANITIZER_LINK_FLAGS})
+    
+    set_target_properties("${TARGET_NAME}" PROPERTIES
+        RUNTIME_OUTPUT_DIRECTORY "${OUT_DIR}"
+        LIBRARY_OUTPUT_DIRECTORY "${OUT_DIR}"
+        ARCHIVE_OUTPUT_DIRECTORY "${OUT_DIR}")
+
+    install_dy_libs("${TARGET_NAME}" "${OUT_DIR}" "${DY_LIBS}")
+endfunction()
+
+function (add_test_targets TEST_DIR TEST_FILES HEADERS INCLUDE_DIRS LINK_LIBS DY_LIBS DEFS FLAGS FEATURES LINKER_FLAGS OUT_TEST_TARGETS)
+    set(TEST_TARGETS "")
+
+    # Every test file is built into its own executable and registered as its own test, so CTest can run them in parallel
+    foreach (TEST_FILE ${TEST_FILES})
+        file(RELATIVE_PATH TEST_NAME "${TEST_DIR}" "${TEST_FILE}")
+        string(REGEX REPLACE "\\.[^./]*$" "" TEST_NAME "${TEST_NAME}")
+        string(MAKE_C_IDENTIFIER "${TEST_NAME}" TEST_NAME)
+        set(TEST_TARGET "test_${TEST_NAME}")
+
+        add_exec_target("${TEST_TARGET}" "${TEST_FILE}" "${HEADERS}" "${INCLUDE_DIRS}" "${LINK_LIBS}" "${DY_LIBS}" "${DEFS}" "${FLAGS}" "${FEATURES}" "${LINKER_FLAGS}" TRUE)
+        add_test(NAME "${TEST_NAME}" COMMAND "${TEST_TARGET}")
+
+        # Test properties are read from comments in the test file, e.g. "// ctest: RESOURCE_LOCK database PROCESSORS 2"
+        set(PROPERTIES PROCESSORS 1)
+        file(STRINGS "${TEST_FILE}" PROPERTY_LINES REGEX "^[ \t]*(//|/\\*)[ \t]*ctest:")
+
+        foreach (PROPERTY_LINE ${PROPERTY_LINES})
+            string(REGEX REPLACE "^[ \t]*(//|/\\*)[ \t]*ctest:|\\*/[ \t]*$" "" PROPERTY_LINE "${PROPERTY_LINE}")
+            separate_arguments(PROPERTY_LINE UNIX_COMMAND "${PROPERTY_LINE}")
+            list(APPEND PROPERTIES ${PROPERTY_LINE})
+        endforeach()
+
+        set_tests_properties("${TEST_NAME}" PROPERTIES ${PROPERTIES})
+        list(APPEND TEST_TARGETS "${TEST_TARGET}")
+    endforeach()
+
+    if (TEST_TARGETS)
+        add_custom_target(tests)
+        add_dependencies(tests ${TEST_TARGETS})
+    endif()
+
+    set(${OUT_TEST_TARGETS} "${TEST_TARGETS}" PARENT_SCOPE)
+endfunction()
+
+function (add_run_tests_target JOBS SHARD_COUNT SHARD_INDEX)
+    if (NOT TARGET tests)
+        return()
+    endif()
+
+    if (NOT SHARD_INDEX LESS SHARD_COUNT)
+        message(FATAL_ERROR "TEST_SHARD_INDEX (${SHARD_INDEX}) must be less than TEST_SHARD_COUNT (${SHARD_COUNT}).")
+    endif()
+
+    # A shard runs every SHARD_COUNT-th test starting from the one at SHARD_INDEX
+    set(SHARD_ARGS "")
+    if (SHARD_COUNT GREATER 1)
+        math(EXPR SHARD_START "${SHARD_INDEX} + 1")
+        set(SHARD_ARGS -I "${SHARD_START},,${SHARD_COUNT}")
+    endif()
+
+    add_custom_target(run_tests
+        COMMAND "${CMAKE_CTEST_COMMAND}" -C "$<CONFIG>" -j "${JOBS}" --output-on-failure ${SHARD_ARGS}
+        WORKING_DIRECTORY "${CMAKE_BINARY_DIR}"
+        COMMENT "Running the tests with ${JOBS} jobs"
+        VERBATIM)
+
+    add_dependencies(run_tests tests)
+endfunction()
+
+function (add_run_benchmarks_target TARGET_NAME)
+    if (NOT TARGET "${TARGET_NAME}")
+        return()
+    endif()
+
+    # The results are written in the JSON format of Google Benchmark next to the benchmarks executable
+    set(RESULTS_FILE "$<TARGET_FILE_DIR:${TARGET_NAME}>/${TARGET_NAME}.json")
+    set(BENCHMARK_ARGS "" CACHE STRING "Additional command line arguments passed to the benchmarks by the run_benchmarks target")
+    separate_arguments(EXTRA_ARGS NATIVE_COMMAND "${BENCHMARK_ARGS}")
+
+    add_custom_target(run_benchmarks
+        COMMAND "$<TARGET_FILE:${TARGET_NAME}>" "--benchmark_out=${RESULTS_FILE}" --benchmark_out_format=json ${EXTRA_ARGS}
+        WORKING_DIRECTORY "$<TARGET_FILE_DIR:${TARGET_NAME}>"
+        COMMENT "Running ${TARGET_NAME}"
+        VERBATIM)
+
+    add_dependencies(run_benchmarks "${TARGET_NAME}")
+endfunction()
+
+function (add_check_benchmarks_target TARGET_NAME)
+    if (NOT TARGET run_benchmarks)
+        return()
+    endif()
+
+    find_package (Python COMPONENTS Interpreter)
+
+    if (NOT PYTHON_FOUND)
+        message(STATUS "Python not found, the check_benchmarks target is not available.")
+        return()
+    endif()
+
+    set(BENCHMARK_REGRESSION_THRESHOLD 5 CACHE STRING "Slowdown in percent a benchmark is allowed before the check_benchmarks target fails")
+    set(BENCHMARK_BASELINE_RUNS 5 CACHE STRING "Number of the latest recorded benchmark runs the baseline is pooled from")
+
+    # The history is kept next to the results, so every configuration has its own baseline
+    set(RESULTS_FILE "$<TARGET_FILE_DIR:${TARGET_NAME}>/${TARGET_NAME}.json")
+    set(HISTORY_FILE "$<TARGET_FILE_DIR:${TARGET_NAME}>/${TARGET_NAME}_history.json")
+
+    add_custom_target(check_benchmarks
+        COMMAND "${Python_EXECUTABLE}" "${CMAKE_SOURCE_DIR}/{[(PROJ_OR_EMPTY)]}utils/bench_history.py" "${RESULTS_FILE}"
+                --history "${HISTORY_FILE}" --threshold "${BENCHMARK_REGRESSION_THRESHOLD}" --baseline-runs "${BENCHMARK_BASELINE_RUNS}"
+        COMMENT "Comparing the results of ${TARGET_NAME} against their history"
+        VERBATIM)
+
+    add_dependencies(check_benchmarks run_benchmarks)
+endfunction()"""
+
+    bench_history_py = r"""# This file was generated by Xen ProjGen.
+# File: bench_history.py
+# Version: 1.0
+# Author: XeniaPhe
+# License: MIT License
+# Github: https://github.com/XeniaPhe/Xen-ProjGen
+# Description: Keeps a rolling history of benchmark results and fails on statistically significant regressions
+
+import os
+import sys
+import json
+import random
+import argparse
+import statistics
+
+time_units = {"ns": 1.0, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+parser = argparse.ArgumentParser(description = "Compares benchmark results in the JSON format of Google Benchmark against their history")
+parser.add_argument("results", help = "JSON results of the benchmarks")
+parser.add_argument("--history", required = True, help = "JSON history file, created if it does not exist")
+parser.add_argument("--threshold", type = float, default = 5.0, help = "Slowdown in percent a benchmark is allowed (default: 5)")
+parser.add_argument("--metric", choices = ["real_time", "cpu_time"], default = "real_time", help = "Time compared (default: real_time)")
+parser.add_argument("--baseline-runs", type = int, default = 5, help = "Number of the latest recorded runs the baseline is pooled from (default: 5)")
+parser.add_argument("--max-runs", type = int, default = 50, help = "Number of runs kept in the history (default: 50)")
+parser.add_argument("--accept", action = "store_true", help = "Record the results even if they regressed, making them part of the baseline")
+args = parser.parse_args()
+
+def read_json(path):
+    try:
+        with open(path, 'r', encoding = 'utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path}:\n {e}", file = sys.stderr)
+        sys.exit(2)
+
+# Collects the samples of every benchmark in nanoseconds, skipping the aggregates Google Benchmark may add
+def read_samples(results):
+    samples = {}
+
+    for benchmark in results.get("benchmarks", []):
+        if benchmark.get("run_type", "iteration") != "iteration" or benchmark.get("error_occurred"):
+            continue
+
+        name = benchmark.get("run_name", benchmark["name"])
+        scale = time_units.get(benchmark.get("time_unit", "ns"), 1.0)
+        samples.setdefault(name, []).append(benchmark[args.metric] * scale)
+
+    return samples
+
+def median_absolute_deviation(samples):
+    median = statistics.median(samples)
+    return statistics.median(abs(sample - median) for sample in samples)
+
+# Bootstraps the 95% confidence interval of the relative change between the medians, seeded to be reproducible
+def confidence_interval(baseline, current, resamples = 2000):
+    rng = random.Random(0)
+    changes = []
+
+    for _ in range(resamples):
+        baseline_median = statistics.median(rng.choices(baseline, k = len(baseline)))
+        current_median = statistics.median(rng.choices(current, k = len(current)))
+        changes.append((current_median - baseline_median) / baseline_median * 100.0)
+
+    changes.sort()
+    return changes[int(resamples * 0.025)], changes[int(resamples * 0.975) - 1]
+
+def format_time(nanoseconds):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if nanoseconds >= scale:
+            return f"{nanoseconds / scale:.2f} {unit}"
+
+    return f"{nanoseconds:.2f} ns"
+
+results = read_json(args.results)
+current = read_samples(results)
+
+if not current:
+    print(f"No benchmark results found in {args.results}", file = sys.stderr)
+    sys.exit(2)
+
+if results.get("context", {}).get("library_build_type") == "debug":
+    print("Warning: The benchmarks were built without NDEBUG, the results may not be representative")
+
+history = read_json(args.history) if os.path.exists(args.history) else {"metric": args.metric, "runs": []}
+
+if history.get("metric", args.metric) != args.metric:
+    print(f"The history in {args.history} records {history['metric']}, not {args.metric}", file = sys.stderr)
+    sys.exit(2)
+
+baseline_runs = history["runs"][-args.baseline_runs:] if args.baseline_runs > 0 else []
+regressions = []
+
+print(f"{'Benchmark':<40} {'Baseline':>12} {'Current':>12} {'Change':>9} {'95% CI':>19} {'MAD':>8}  Status")
+
+for name, samples in current.items():
+    baseline = [sample for run in baseline_runs for sample in run["benchmarks"].get(name, [])]
+    current_median = statistics.median(samples)
+    mad = median_absolute_deviation(samples) / current_median * 100.0 if current_median else 0.0
+
+    if not baseline:
+        print(f"{name:<40} {'-':>12} {format_time(current_median):>12} {'-':>9} {'-':>19} {mad:>7.1f}%  new")
+        continue
+
+    baseline_median = statistics.median(baseline)
+    change = (current_median - baseline_median) / baseline_median * 100.0
+    low, high = confidence_interval(baseline, samples)
+
+    # Only a slowdown above the threshold whose confidence interval excludes no change counts as a regression
+    if change > args.threshold and low > 0.0:
+        status = "REGRESSED"
+        regressions.append(name)
+    elif change < 0.0 and high < 0.0:
+        status = "improved"
+    else:
+        status = "ok"
+
+    interval = f"[{low:+.1f}%, {high:+.1f}%]"
+    print(f"{name:<40} {format_time(baseline_median):>12} {format_time(current_median):>12} {change:>+8.1f}% {interval:>19} {mad:>7.1f}%  {status}")
+
+# Regressed results are kept out of the history so they do not become part of the baseline, unless accepted
+if not regressions or args.accept:
+    history["metric"] = args.metric
+    history["runs"].append({"date": results.get("context", {}).get("date", ""), "benchmarks": current})
+    history["runs"] = history["runs"][-max(args.max_runs, 1):]
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok = True)
+    temp_file = f"{args.history}.tmp"
+
+    with open(temp_file, 'w', encoding = 'utf-8') as file:
+        json.dump(history, file, indent = 2)
+
+    os.replace(temp_file, args.history)
+    print(f"Recorded the results in {args.history} ({len(history['runs'])} runs)")
+
+if regressions and args.accept:
+    print(f"Accepted the regression of {len(regressions)} benchmark(s): {', '.join(regressions)}")
+elif regressions:
+    print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold}%: {', '.join(regressions)}", file = sys.stderr)
+    sys.exit(1)"""
+
+    flags_cmake = r"""# This file was generated by Xen ProjGen.
+# File: flags.cmake
+# Version: 1.0
+# Author: XeniaPhe
+# License: MIT License
+# Github: https://github.com/XeniaPhe/Xen-ProjGen
+# Description: Parses the compiler_flags.yaml file in CMake, replacing fetch_flags.py (Delete this file to use fetch_flags.py)
+
+set(FLAG_COMPILERS "GCC;CLANG;MSVC")
+set(FLAG_BUILD_TYPES "DEBUG;RELEASE;MINSIZEREL;RELWITHDEBINFO;PGOGENERATE;PGOUSE;ASAN;TSAN;UBSAN;MSAN")
+set(FLAG_PROFILES "PERFORMANCE;HARDENING")
+
+# Sets FLAGS_<COMPILER>_<BUILD_TYPE> in the calling scope for every compiler and build type, composed from the profile
+# expression, if any (e.g. "+perf -warnings"). +name adds the enabled entries of the profile and every entry tagged with
+# the name whether it is enabled or not, -name removes them. Profiles skip debug builds
+function (parse_compiler_flags YAML_FILE PROFILE)
+    foreach (COMPILER ${FLAG_COMPILERS})
+        foreach (SECTION ${FLAG_BUILD_TYPES} ${FLAG_PROFILES})
+            set(ENTRIES_${COMPILER}_${SECTION} "")
+        endforeach()
+    endforeach()
+
+    # Only read the lines that matter, skipping the descriptions and comments
+    file(STRINGS "${YAML_FILE}" LINES REGEX "^[ \t]*([A-Za-z]+:[ \t]*(#.*)?$|- flag:|tags:|enabled:)")
+
+    set(COMPILER "")
+    set(SECTION "")
+    set(FLAG "")
+    set(TAGS ",")
+    string(TOLOWER "${FLAG_PROFILES}" KNOWN_NAMES)
+
+    # Each entry is stored as <enabled>|,<tags>,|<flag>
+    foreach (LINE IN LISTS LINES)
+        string(TOUPPER "${LINE}" UPPER_LINE)
+
+        if (UPPER_LINE MATCHES "^[ \t]*(GCC|CLANG|MSVC):")
+            set(COMPILER "${CMAKE_MATCH_1}")
+            set(SECTION "")
+            set(FLAG "")
+        elseif (NOT "${COMPILER}" STREQUAL "" AND UPPER_LINE MATCHES "^[ \t]*(DEBUG|RELEASE|MINSIZEREL|RELWITHDEBINFO|PGOGENERATE|PGOUSE|ASAN|TSAN|UBSAN|MSAN|PERFORMANCE|HARDENING):")
+            set(SECTION "${CMAKE_MATCH_1}")
+            set(FLAG "")
+        elseif ("${SECTION}" STREQUAL "")
+            continue()
+        elseif ("${FLAG}" STREQUAL "" AND LINE MATCHES "^[ \t]*- flag: \"(.*)\"")
+            set(FLAG "${CMAKE_MATCH_1}")
+            set(TAGS ",")
+        elseif (NOT "${FLAG}" STREQUAL "" AND LINE MATCHES "^[ \t]*tags: \\[(.*)\\]")
+            string(TOLOWER "${CMAKE_MATCH_1}" TAG_LIST)
+            string(REGEX REPLACE "[ \t\"']" "" TAG_LIST "${TAG_LIST}")
+            set(TAGS ",${TAG_LIST},")
+            string(REPLACE "," ";" TAG_LIST "${TAG_LIST}")
+            list(APPEND KNOWN_NAMES ${TAG_LIST})
+        elseif (NOT "${FLAG}" STREQUAL "" AND LINE MATCHES "^[ \t]*enabled: (true|false)")
+            if ("${CMAKE_MATCH_1}" STREQUAL "true")
+                list(APPEND ENTRIES_${COMPILER}_${SECTION} "1|${TAGS}|${FLAG}")
+            else()
+                list(APPEND ENTRIES_${COMPILER}_${SECTION} "0|${TAGS}|${FLAG}")
+            endif()
+
+            set(FLAG "")
+        endif()
+    endforeach()
+
+    string(TOLOWER "${PROFILE}" PROFILE)
+    string(REGEX MATCHALL "[^ \t]+" TERMS "${PROFILE}")
+    list(REMOVE_DUPLICATES KNOWN_NAMES)
+
+    foreach (TERM ${TERMS})
+        if (NOT TERM MATCHES "^[+-]?([a-z0-9_-]+)$")
+            message(FATAL_ERROR "Invalid term '${TERM}' in the profile expression '${PROFILE}', expected +name or -name")
+        elseif (NOT "${CMAKE_MATCH_1}" IN_LIST KNOWN_NAMES)
+            list(SORT KNOWN_NAMES)
+            string(REPLACE ";" ", " KNOWN_NAMES "${KNOWN_NAMES}")
+            message(FATAL_ERROR "Unknown profile or tag '${CMAKE_MATCH_1}', expected one of: ${KNOWN_NAMES}")
+        endif()
+    endforeach()
+
+    foreach (COMPILER ${FLAG_COMPILERS})
+        foreach (BUILD_TYPE ${FLAG_BUILD_TYPES})
+            set(SECTIONS "${BUILD_TYPE}")
+            if (NOT "${BUILD_TYPE}" STREQUAL "DEBUG")
+                list(APPEND SECTIONS ${FLAG_PROFILES})
+            endif()
+
+            set(SELECTED "")
+            foreach (ENTRY IN LISTS ENTRIES_${COMPILER}_${BUILD_TYPE})
+                if (ENTRY MATCHES "^1\\|[^|]*\\|(.*)$")
+                    list(APPEND SELECTED "${CMAKE_MATCH_1}")
+                endif()
+            endforeach()
+
+            list(REMOVE_DUPLICATES SELECTED)
+
+            foreach (TERM ${TERMS})
+                string(SUBSTRING "${TERM}" 0 1 SIGN)
+                string(REGEX REPLACE "^[+-]" "" NAME "${TERM}")
+                string(TOUPPER "${NAME}" UPPER_NAME)
+
+                set(MATCHED "")
+                foreach (SECTION ${SECTIONS})
+                    foreach (ENTRY IN LISTS ENTRIES_${COMPILER}_${SECTION})
+                        string(REGEX MATCH "^([01])\\|([^|]*)\\|(.*)$" ENTRY "${ENTRY}")
+                        set(ENABLED "${CMAKE_MATCH_1}")
+                        set(FLAG "${CMAKE_MATCH_3}")
+                        string(FIND "${CMAKE_MATCH_2}" ",${NAME}," TAG_INDEX)
+
+                        if (NOT TAG_INDEX EQUAL -1 OR ("${SECTION}" STREQUAL "${UPPER_NAME}" AND ENABLED))
+                            list(APPEND MATCHED "${FLAG}")
+                        endif()
+                    endforeach()
+                endforeach()
+
+                if ("${SIGN}" STREQUAL "-")
+                    if (NOT "${MATCHED}" STREQUAL "")
+                        list(REMOVE_ITEM SELECTED ${MATCHED})
+                    endif()
+                else()
+                    foreach (FLAG IN LISTS MATCHED)
+                        if (NOT "${FLAG}" IN_LIST SELECTED)
+                            list(APPEND SELECTED "${FLAG}")
+                        endif()
+                    endforeach()
+                endif()
+            endforeach()
+
+            set(FLAGS_${COMPILER}_${BUILD_TYPE} "${SELECTED}" PARENT_SCOPE)
+        endforeach()
+    endforeach()
+endfunction()"""
+
+    proj_or_empty = 'project/' if conf.has_proj_dir else ''
+    build_or_empty = 'build/' if conf.is_out_in_build_dir else ''
+
+    functions_cmake = render_template(functions_cmake, PROJ_OR_EMPTY = proj_or_empty, BUILD_OR_EMPTY = build_or_empty)
 
     utils_dir = gen_dir(cwd, 'utils')
     gen_file(utils_dir, 'functions.cmake', functions_cmake)
     gen_file(utils_dir, 'fetch_flags.py', fetch_flags_py)
 
-def gen_config_dir(cwd: str, conf: ProjectConfig):
-    
-    c_only_enable = 'true' if conf.use_c else 'false'
+    if conf.should_include_benchmarks:
+        gen_file(utils_dir, 'bench_history.py', bench_history_py)
+
+    if conf.use_cmake_flag_parser:
+        gen_file(utils_dir, 'flags.cmake', flags_cmake)
+
+def gen_config_dir(cwd: str, conf: ProjectConfig):
+    
+    c_only_enable = 'true' if conf.use_c else 'false'
+
+    # The instrumented and the optimized builds must be compiled with the same flags for the profile to match
+    pgo_build_types = """
+  pgogenerate:
+    - flag: "{[(FLAG)]}"
+      description: "{[(DESCRIPTION)]} (Instrumented build, keep in sync with pgouse)"
+      documentation: "{[(DOCUMENTATION)]}"
+      enabled: true
+  pgouse:
+    - flag: "{[(FLAG)]}"
+      description: "{[(DESCRIPTION)]} (Profile-optimized build, keep in sync with pgogenerate)"
+      documentation: "{[(DOCUMENTATION)]}"
+      enabled: true"""
+
+    if conf.use_pgo:
+        gcc_pgo_build_types = render_template(pgo_build_types, FLAG = '-O3', DESCRIPTION = 'Optimize for maximum performance',
+            DOCUMENTATION = 'https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-O3')
+        clang_pgo_build_types = render_template(pgo_build_types, FLAG = '-O3', DESCRIPTION = 'Optimize for maximum performance',
+            DOCUMENTATION = 'https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level')
+        msvc_pgo_build_types = render_template(pgo_build_types, FLAG = '/O2', DESCRIPTION = 'Optimize for speed',
+            DOCUMENTATION = 'https://learn.microsoft.com/en-us/cpp/build/reference/o1-o2-minimize-size-maximize-speed?view=msvc-170')
+    else:
+        gcc_pgo_build_types = ''
+        clang_pgo_build_types = ''
+        msvc_pgo_build_types = ''
+
+    # Each sanitizer gets its own build type, only the ones a compiler supports are listed under it
+    gcc_sanitizer_build_types = """
+  asan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-O1"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Debugging-Options.html#index-g"
+      enabled: true
+
+    - flag: "-fno-omit-frame-pointer"
+      description: "Keep the frame pointer for complete stack traces in the reports"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-fomit-frame-pointer"
+      enabled: true
+
+    - flag: "-fsanitize=address"
+      description: "Enable address sanitizer (Also passed to the linker)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fsanitize_003daddress"
+      tags: [sanitizer]
+      enabled: true
+  tsan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-O1"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Debugging-Options.html#index-g"
+      enabled: true
+
+    - flag: "-fsanitize=thread"
+      description: "Enable thread sanitizer (Also passed to the linker)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fsanitize_003dthread"
+      tags: [sanitizer]
+      enabled: true
+  ubsan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-O1"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Debugging-Options.html#index-g"
+      enabled: true
+
+    - flag: "-fsanitize=undefined"
+      description: "Enable undefined behavior sanitizer (Also passed to the linker)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fsanitize_003dundefined"
+      tags: [sanitizer]
+      enabled: true
+
+    - flag: "-fno-sanitize-recover=undefined"
+      description: "Abort on the first undefined behavior instead of reporting it and continuing"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fno-sanitize-recover"
+      tags: [sanitizer]
+      enabled: false"""
+
+    clang_sanitizer_build_types = """
+  asan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#debug-level"
+      enabled: true
+
+    - flag: "-fno-omit-frame-pointer"
+      description: "Keep the frame pointer for complete stack traces in the reports"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fomit-frame-pointer"
+      enabled: true
+
+    - flag: "-fsanitize=address"
+      description: "Enable address sanitizer (Also passed to the linker)"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/AddressSanitizer.html"
+      tags: [sanitizer]
+      enabled: true
+  tsan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#debug-level"
+      enabled: true
+
+    - flag: "-fsanitize=thread"
+      description: "Enable thread sanitizer (Also passed to the linker)"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/ThreadSanitizer.html"
+      tags: [sanitizer]
+      enabled: true
+  ubsan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#debug-level"
+      enabled: true
+
+    - flag: "-fsanitize=undefined"
+      description: "Enable undefined behavior sanitizer (Also passed to the linker)"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/UndefinedBehaviorSanitizer.html#undefinedbehaviorsanitizer"
+      tags: [sanitizer]
+      enabled: true
+
+    - flag: "-fno-sanitize-recover=undefined"
+      description: "Abort on the first undefined behavior instead of reporting it and continuing"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/UndefinedBehaviorSanitizer.html#usage"
+      tags: [sanitizer]
+      enabled: false
+  msan:
+    - flag: "-O1"
+      description: "Optimize lightly, keeping the sanitizer reports accurate"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level"
+      enabled: true
+
+    - flag: "-g3"
+      description: "Generate debug information"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#debug-level"
+      enabled: true
+
+    - flag: "-fno-omit-frame-pointer"
+      description: "Keep the frame pointer for complete stack traces in the reports"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fomit-frame-pointer"
+      enabled: true
+
+    - flag: "-fsanitize=memory"
+      description: "Enable memory sanitizer (Also passed to the linker, every linked library has to be instrumented as well)"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/MemorySanitizer.html"
+      tags: [sanitizer]
+      enabled: true
+
+    - flag: "-fsanitize-memory-track-origins"
+      description: "Report where the uninitialized memory came from (Slows the program down further)"
+      documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/MemorySanitizer.html#origin-tracking"
+      tags: [sanitizer]
+      enabled: true"""
+
+    msvc_sanitizer_build_types = """
+  asan:
+    - flag: "/Zi"
+      description: "Generate complete debug information"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/z7-zi-zi-debug-information-format?view=msvc-170"
+      enabled: true
+
+    - flag: "/fsanitize=address"
+      description: "Enable address sanitizer"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/fsanitize?view=msvc-170"
+      tags: [sanitizer]
+      enabled: true"""
+
+    if not conf.use_sanitizer_builds:
+        gcc_sanitizer_build_types = ''
+        clang_sanitizer_build_types = ''
+        msvc_sanitizer_build_types = ''
 
     compiler_flags_yaml = f"""# This file was generated by Xen ProjGen.
 file: "compiler_flags.yaml"
@@ -567,6 +2129,12 @@ description: "YAML configuration file for compiler flags for GCC, Clang, and MSV
 # Disable warnings: Use /wd followed by the warning number (e.g. /wd4100)
 # Treat warnings as errors: Use /we followed by the warning number (e.g. /we4715)
 
+# Profiles and tags
+# The performance and hardening sections of each compiler are profiles rather than build types. Entries can also carry tags
+# (e.g. tags: [warnings, perf]). CMake is configured with a profile expression such as -DCOMPILER_FLAGS_PROFILE="+perf -warnings":
+# +name adds the enabled entries of the profile and every entry tagged with the name, enabled or not, while -name removes them
+# The entries of profiles are only added to the build types other than debug
+
 gcc:
   debug:
     - flag: "-O0"
@@ -590,143 +2158,171 @@ gcc:
       enabled: false
 
     - flag: "-fsanitize=undefined"
-      description: "Enable undefined behavior sanitizer (Requires linker flags as well)"
+      description: "Enable undefined behavior sanitizer (Also passed to the linker)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fsanitize_003dundefined"
+      tags: [sanitizer]
       enabled: false
 
     - flag: "-fsanitize=address"
-      description: "Enable address sanitizer (Requires linker flags as well)"
+      description: "Enable address sanitizer (Also passed to the linker)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fsanitize_003daddress"
+      tags: [sanitizer]
       enabled: false
 
     - flag: "-Wall"
       description: "Enable most warning messages"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wall"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wextra"
       description: "Enable extra warning messages"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wextra"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wconversion"
       description: "Warn about implicit type conversions"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wconversion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wdouble-promotion"
       description: "Warn if a value is promoted to double"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wdouble-promotion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-parameter"
       description: "Disable warnings about unused parameters"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wno-unused-parameter"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-function"
       description: "Disable warnings about unused functions"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wno-unused-function"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-result"
       description: "Disable warnings about unused results"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wno-unused-result"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-sign-conversion"
       description: "Disable warnings about sign conversion"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wno-sign-conversion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wfloat-equal"
       description: "Warn about comparisons between floating point values"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wfloat-equal"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wundef"
       description: "Warn if an undefined identifier is evaluated"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wundef"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wshadow"
       description: "Warn when a local variable shadows another variable"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wshadow"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wpointer-arith"
       description: "Warn about pointer arithmetic"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wpointer-arith"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wcast-align"
       description: "Warn when a pointer cast decreases alignment"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wcast-align"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wstrict-prototypes"
       description: "Warn if a function is not declared with a prototype (C only)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wstrict-prototypes"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wmissing-prototypes"
       description: "Warn if a function is not declared with a prototype (C only)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wmissing-prototypes"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wstrict-overflow=4"
       description: "Warn about optimizations that assume overflow does not occur"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wstrict-overflow"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wwrite-strings"
       description: "Warn when a string literal is assigned to a `char*`"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wwrite-strings"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wcast-qual"
       description: "Warn when a pointer is cast to a different type that may change the type qualifiers"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wcast-qual"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wswitch-default"
       description: "Warn if a `switch` statement does not have a `default` case"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wswitch-default"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wswitch-enum"
       description: "Warn if a `switch` statement does not handle all enumeration values"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wswitch-enum"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Werror=return-type"
       description: "Treat missing return statements as errors"
       documentation: "#https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wreturn-type"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Werror=implicit-function-declaration"
       description: "Treat implicit function declarations as errors (C only)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wimplicit-function-declaration"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Werror=incompatible-pointer-types"
       description: "Treat incompatible pointer types as errors (C only)"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wincompatible-pointer-types"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wformat=2"
       description: "Warn about format string issues"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wformat"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wuninitialized"
       description: "Warn about uninitialized variables"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wuninitialized"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wunreachable-code"
       description: "Warn about code that is unreachable"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc-4.4.7/gcc/Warning-Options.html#index-Wunreachable_002dcode-437"
+      tags: [warnings]
       enabled: true
   release:
     - flag: "-O3"
@@ -737,6 +2333,7 @@ gcc:
     - flag: "-Ofast"
       description: "Enable -O3 and more optimizations that are not valid for all standard-compliant programs"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-Ofast"
+      tags: [fast-math]
       enabled: false
   minsizerel:
     - flag: "-Os"
@@ -757,7 +2354,67 @@ gcc:
     - flag: "-g3"
       description: "Generate debug information"
       documentation: "https://gcc.gnu.org/onlinedocs/gcc/Debugging-Options.html#index-g"
+      enabled: true{gcc_pgo_build_types}{gcc_sanitizer_build_types}
+  performance:
+    - flag: "-march=native"
+      description: "Generate code for the instruction sets of the host CPU (The binaries may not run on other CPUs)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/x86-Options.html"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-mtune=native"
+      description: "Tune the generated code for the host CPU without changing the instruction sets used"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/x86-Options.html"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-plt"
+      description: "Call the functions of shared libraries through the GOT instead of the PLT (ELF targets only)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Code-Gen-Options.html#index-fno-plt"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-semantic-interposition"
+      description: "Assume exported functions are not interposed, allowing them to be inlined within shared libraries"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-fno-semantic-interposition"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-omit-frame-pointer"
+      description: "Keep the frame pointer so that sampling profilers can walk the stack, at a small cost"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-fomit-frame-pointer"
+      tags: [profiling]
+      enabled: false
+
+    - flag: "-funroll-loops"
+      description: "Unroll loops whose number of iterations can be determined at compile time"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Optimize-Options.html#index-funroll-loops"
+      enabled: false
+  hardening:
+    - flag: "-U_FORTIFY_SOURCE"
+      description: "Undefine the fortify level the compiler may set by default, so that the one below takes effect"
+      documentation: "https://man7.org/linux/man-pages/man7/feature_test_macros.7.html"
       enabled: true
+
+    - flag: "-D_FORTIFY_SOURCE=2"
+      description: "Check the buffer sizes of the string and memory functions of the C library at run time (Requires optimization)"
+      documentation: "https://man7.org/linux/man-pages/man7/feature_test_macros.7.html"
+      enabled: true
+
+    - flag: "-fstack-protector-strong"
+      description: "Check functions with local arrays or address-taken locals for stack buffer overflows"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fstack-protector-strong"
+      enabled: true
+
+    - flag: "-fstack-clash-protection"
+      description: "Probe large stack allocations page by page so that they can not jump over the guard page"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fstack-clash-protection"
+      enabled: true
+
+    - flag: "-fcf-protection"
+      description: "Instrument indirect branches and returns for control-flow enforcement (x86 only)"
+      documentation: "https://gcc.gnu.org/onlinedocs/gcc/Instrumentation-Options.html#index-fcf-protection"
+      enabled: false
 clang:
   debug:
     - flag: "-O0"
@@ -776,138 +2433,165 @@ clang:
       enabled: false
 
     - flag: "-fsanitize=undefined"
-      description: "Enable undefined behavior sanitizer (Requires linker flags as well)"
+      description: "Enable undefined behavior sanitizer (Also passed to the linker)"
       documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/UndefinedBehaviorSanitizer.html#undefinedbehaviorsanitizer"
+      tags: [sanitizer]
       enabled: false
 
     - flag: "-fsanitize=address"
-      description: "Enable address sanitizer (Requires linker flags as well)"
+      description: "Enable address sanitizer (Also passed to the linker)"
       documentation: "https://releases.llvm.org/12.0.0/tools/clang/docs/AddressSanitizer.html"
+      tags: [sanitizer]
       enabled: false
 
     - flag: "-Wall"
       description: "Enable most warning messages"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wall"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wextra"
       description: "Enable extra warning messages"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wextra"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wconversion"
       description: "Warn about implicit type conversions"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wconversion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wdouble-promotion"
       description: "Warn if a value is promoted to double"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wdouble-promotion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-parameter"
       description: "Disable warnings about unused parameters"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wunused-parameter"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-function"
       description: "Disable warnings about unused functions"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wunused-function"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-unused-result"
       description: "Disable warnings about unused results"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wunused-result"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wno-sign-conversion"
       description: "Disable warnings about sign conversion"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wsign-conversion"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wfloat-equal"
       description: "Warn about comparisons between floating point values"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wfloat-equal"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wundef"
       description: "Warn if an undefined identifier is evaluated"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wundef"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wshadow"
       description: "Warn when a local variable shadows another local variable"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wshadow"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wpointer-arith"
       description: "Warn about pointer arithmetic"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wpointer-arith"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wcast-align"
       description: "Warn when a pointer cast decreases alignment"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wcast-align"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wstrict-prototypes"
       description: "Warn if a function is not declared with a prototype (C only)"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wstrict-prototypes"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wmissing-prototypes"
       description: "Warn if a function is not declared with a prototype (C only)"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wmissing-prototypes"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wwrite-strings"
       description: "Warn when a string literal is assigned to a `char*`"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wwrite-strings"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wcast-qual"
       description: "Warn when a pointer is cast to a different type that may change the type qualifiers"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wcast-qual"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wswitch-default"
       description: "Warn if a `switch` statement does not have a `default` case"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wswitch-default"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wswitch-enum"
       description: "Warn if a `switch` statement does not handle all enumeration values"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wswitch-enum"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Werror=return-type"
       description: "Treat missing return statements as errors"
       documentation: "https://clang.llvm.org/docs/UsersManual.html#cmdoption-Werror #https://clang.llvm.org/docs/DiagnosticsReference.html#wreturn-type"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Werror=implicit-function-declaration"
       description: "Treat implicit function declarations as errors (C only)"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wimplicit-function-declaration"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Werror=incompatible-pointer-types"
       description: "Treat incompatible pointer types as  (C only)"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wincompatible-pointer-types"
+      tags: [warnings]
       enabled: {c_only_enable}
 
     - flag: "-Wformat=2"
       description: "Warn about format string issues"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wformat"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wuninitialized"
       description: "Warn about uninitialized variables"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wuninitialized"
+      tags: [warnings]
       enabled: true
 
     - flag: "-Wunreachable-code-aggressive"
       description: "Warn about aggressive unreachable code detection"
       documentation: "https://clang.llvm.org/docs/DiagnosticsReference.html#wunreachable-code"
+      tags: [warnings]
       enabled: true
   release:
     - flag: "-O3"
@@ -918,6 +2602,7 @@ clang:
     - flag: "-ffast-math"
       description: "Enable math optimizations such as faster floating point operations that are not valid for all standard-compliant programs"
       documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#optimization-level"
+      tags: [fast-math]
       enabled: false
   minsizerel:
     - flag: "-Os"
@@ -938,7 +2623,67 @@ clang:
     - flag: "-g3"
       description: "Generate debug information"
       documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#debug-level"
+      enabled: true{clang_pgo_build_types}{clang_sanitizer_build_types}
+  performance:
+    - flag: "-march=native"
+      description: "Generate code for the instruction sets of the host CPU (The binaries may not run on other CPUs)"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-march"
+      tags: [perf]
       enabled: true
+
+    - flag: "-mtune=native"
+      description: "Tune the generated code for the host CPU without changing the instruction sets used"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-mtune"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-plt"
+      description: "Call the functions of shared libraries through the GOT instead of the PLT (ELF targets only)"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fplt"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-semantic-interposition"
+      description: "Assume exported functions are not interposed, allowing them to be inlined within shared libraries"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fsemantic-interposition"
+      tags: [perf]
+      enabled: true
+
+    - flag: "-fno-omit-frame-pointer"
+      description: "Keep the frame pointer so that sampling profilers can walk the stack, at a small cost"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fomit-frame-pointer"
+      tags: [profiling]
+      enabled: false
+
+    - flag: "-funroll-loops"
+      description: "Unroll loops whose number of iterations can be determined at compile time"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-funroll-loops"
+      enabled: false
+  hardening:
+    - flag: "-U_FORTIFY_SOURCE"
+      description: "Undefine the fortify level the compiler may set by default, so that the one below takes effect"
+      documentation: "https://man7.org/linux/man-pages/man7/feature_test_macros.7.html"
+      enabled: true
+
+    - flag: "-D_FORTIFY_SOURCE=2"
+      description: "Check the buffer sizes of the string and memory functions of the C library at run time (Requires optimization)"
+      documentation: "https://man7.org/linux/man-pages/man7/feature_test_macros.7.html"
+      enabled: true
+
+    - flag: "-fstack-protector-strong"
+      description: "Check functions with local arrays or address-taken locals for stack buffer overflows"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fstack-protector-strong"
+      enabled: true
+
+    - flag: "-fstack-clash-protection"
+      description: "Probe large stack allocations page by page so that they can not jump over the guard page"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fstack-clash-protection"
+      enabled: true
+
+    - flag: "-fcf-protection"
+      description: "Instrument indirect branches and returns for control-flow enforcement (x86 only)"
+      documentation: "https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-fcf-protection"
+      enabled: false
 msvc:
   debug:
     - flag: "/Od"
@@ -964,86 +2709,103 @@ msvc:
     - flag: "/fsanitize=address"
       description: "Enable address sanitizer"
       documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/fsanitize?view=msvc-170"
+      tags: [sanitizer]
       enabled: true
 
     - flag: "/W4"
       description: "Set warning level to 4, enable most warning messages"
       documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/compiler-option-warning-level?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14244"
       description: "Warn about implicit type conversions (Already included at level 2)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-levels-3-and-4-c4244?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/wd4100"
       description: "Disable warnings about unused parameters"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4100?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/wd4505"
       description: "Disable warnings about unused functions"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4505?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/wd4365"
       description: "Disable warnings about sign conversion (Off by default)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4365?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14668"
       description: "Warn if an undefined identifier is evaluated"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4668?view=msvc-170&redirectedfrom=MSDN"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14459"
       description: "Warn when a local variable shadows another variable (Already included at level 4)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4459?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14061"
       description: "Warn if a `switch` statement does not handle all enumeration values (Off by default)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4061?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14062"
       description: "Warn if a `switch` statement does not have a `default` case (Off by default)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4062?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/we4715"
       description: "Treat missing return statements as errors"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-1-c4715?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/we4013"
       description: "Treat implicit function declarations as errors"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-3-c4013?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/we4133"
       description: "Treat incompatible pointer types as errors"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-3-c4133?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14101"
       description: "Warn about uninitialized variables when they're not used (Already included at level 3)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-3-c4101?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14700"
       description: "Warn about uninitialized variables when they're used (Already included at level 1)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-1-and-level-4-c4700?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/wd4189"
       description: "Disable warnings about initialized but unreferenced variables"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4189?view=msvc-170"
+      tags: [warnings]
       enabled: true
 
     - flag: "/w14702"
       description: "Warn about code that is unreachable (Already included at level 4)"
       documentation: "https://learn.microsoft.com/en-us/cpp/error-messages/compiler-warnings/compiler-warning-level-4-c4702?view=msvc-170"
+      tags: [warnings]
       enabled: true
   release:
     - flag: "/O2"
@@ -1054,6 +2816,7 @@ msvc:
     - flag: "/fp:fast"
       description: "Optimize floating point math for speed and space but the compiler may omit rounding and special values (NaN, infinity) may not behave strictly."
       documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/fp-specify-floating-point-behavior?view=msvc-170#fast"
+      tags: [fast-math]
       enabled: false
   minsizerel:
     - flag: "/O1"
@@ -1074,7 +2837,46 @@ msvc:
     - flag: "/FAs /Fa ./out/dump/"
       description: "Generate source and assembly code listings in the specified directory"
       documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/fa-fa-listing-file?view=msvc-170"
-      enabled: true"""
+      enabled: true{msvc_pgo_build_types}{msvc_sanitizer_build_types}
+  performance:
+    - flag: "/arch:AVX2"
+      description: "Generate code using the AVX2 instructions (The binaries require a CPU with AVX2, x86 and x64 only)"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/arch-x64?view=msvc-170"
+      tags: [perf]
+      enabled: true
+
+    - flag: "/Gw"
+      description: "Package global data in separate sections so that the linker can remove or fold the unused ones"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/gw-optimize-global-data?view=msvc-170"
+      tags: [perf]
+      enabled: true
+
+    - flag: "/Gy"
+      description: "Package functions in separate sections so that the linker can remove or fold the unused ones"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/gy-enable-function-level-linking?view=msvc-170"
+      tags: [perf]
+      enabled: true
+
+    - flag: "/Oy-"
+      description: "Keep the frame pointer so that profilers can walk the stack, at a small cost (x86 only)"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/oy-frame-pointer-omission?view=msvc-170"
+      tags: [profiling]
+      enabled: false
+  hardening:
+    - flag: "/GS"
+      description: "Check functions with local buffers for stack buffer overruns"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/gs-buffer-security-check?view=msvc-170"
+      enabled: true
+
+    - flag: "/sdl"
+      description: "Enable additional security checks and turn security warnings into errors"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/sdl-enable-additional-security-checks?view=msvc-170"
+      enabled: true
+
+    - flag: "/guard:cf"
+      description: "Check the targets of indirect calls at run time with Control Flow Guard (Requires linker flags as well)"
+      documentation: "https://learn.microsoft.com/en-us/cpp/build/reference/guard-enable-control-flow-guard?view=msvc-170"
+      enabled: false"""
 
     config_dir = gen_dir(cwd, 'config')
     gen_file(config_dir, 'compiler_flags.yaml', compiler_flags_yaml)
@@ -1082,6 +2884,12 @@ msvc:
     gen_file(config_dir, 'compiler_features.txt', '')
     gen_file(config_dir, 'linker_flags.txt', '')
 
+    if conf.use_precompiled_headers:
+        gen_file(config_dir, 'precompiled_headers.txt', '')
+
+    if conf.use_unity_build:
+        gen_file(config_dir, 'unity_build_exclude.txt', '')
+
 def gen_workspace_file(cwd: str, conf: ProjectConfig):
     if not conf.should_gen_workspace_file:
         return
@@ -1103,6 +2911,8 @@ def gen_workspace_file(cwd: str, conf: ProjectConfig):
     source_root = f'{conf.proj_name}/' if conf.has_proj_name_dir else ''
     src_path = f'{proj_path}/{source_root}src'
 
+    comment_or_empty = '' if conf.should_add_src_and_include_dirs_to_ws else '// '
+
     include_or_empty = ''
     if conf.should_gen_include_dir:
         include_path = f'{proj_path}/{source_root}{'src/include' if conf.is_include_dir_inside_src else 'include'}'
@@ -1113,15 +2923,16 @@ def gen_workspace_file(cwd: str, conf: ProjectConfig):
         {[(COMMENT_OR_EMPTY)]}    "path": "{[(INCLUDE_PATH)]}"
         {[(COMMENT_OR_EMPTY)]}},"""
 
-        include_or_empty = include_or_empty.replace('{[(INCLUDE_PATH)]}', include_path)
-
-    comment_or_empty = '' if conf.should_add_src_and_include_dirs_to_ws else '// '
+        include_or_empty = render_template(include_or_empty,
+            INCLUDE_PATH = include_path,
+            COMMENT_OR_EMPTY = comment_or_empty)
 
-    workspace_content = workspace_content.replace('{[(PROJ_NAME)]}', conf.proj_name)
-    workspace_content = workspace_content.replace('{[(PROJ_PATH)]}', proj_path)
-    workspace_content = workspace_content.replace('{[(INCLUDE_OR_EMPTY)]}', include_or_empty)
-    workspace_content = workspace_content.replace('{[(COMMENT_OR_EMPTY)]}', comment_or_empty)
-    workspace_content = workspace_content.replace('{[(SRC_PATH)]}', src_path)
+    workspace_content = render_template(workspace_content,
+        PROJ_NAME = conf.proj_name,
+        PROJ_PATH = proj_path,
+        INCLUDE_OR_EMPTY = include_or_empty,
+        COMMENT_OR_EMPTY = comment_or_empty,
+        SRC_PATH = src_path)
     gen_file(cwd, f'{conf.proj_name}.code-workspace', workspace_content)
     
 def gen_proj_dir(cwd: str, conf: ProjectConfig):
@@ -1159,6 +2970,232 @@ int main() {
     if conf.should_include_tests:
         gen_dir(proj_name_dir, 'test')
 
+    gen_bench_dir(proj_name_dir, conf)
+
+def gen_bench_dir(cwd: str, conf: ProjectConfig):
+    if not conf.should_include_benchmarks:
+        return
+
+    bench_h = r"""/* This file was generated by Xen ProjGen.
+ * File: bench.h
+ * Version: 1.0
+ * Author: XeniaPhe
+ * License: MIT License
+ * Github: https://github.com/XeniaPhe/Xen-ProjGen
+ * Description: Minimal benchmark harness for C and C++, writes its results in the JSON format of Google Benchmark
+ */
+
+#ifndef XEN_PROJGEN_BENCH_H
+#define XEN_PROJGEN_BENCH_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#if defined(_WIN32)
+#include <windows.h>
+#else
+#include <sys/time.h>
+#endif
+
+/* A benchmark runs the code it measures the given number of times */
+typedef void (*bench_function)(size_t iterations);
+
+typedef struct bench_case {
+    const char* name;
+    bench_function function;
+} bench_case;
+
+#define BENCH_CASE(function) { #function, function }
+
+static double bench_now(void) {
+#if defined(_WIN32)
+    LARGE_INTEGER frequency, counter;
+    QueryPerformanceFrequency(&frequency);
+    QueryPerformanceCounter(&counter);
+    return (double)counter.QuadPart / (double)frequency.QuadPart;
+#else
+    struct timeval now;
+    gettimeofday(&now, NULL);
+    return (double)now.tv_sec + (double)now.tv_usec * 1e-6;
+#endif
+}
+
+static double bench_measure(bench_function function, size_t iterations, double* cpu_seconds) {
+    clock_t cpu_start = clock();
+    double start = bench_now();
+    double elapsed;
+
+    function(iterations);
+    elapsed = bench_now() - start;
+    *cpu_seconds = (double)(clock() - cpu_start) / CLOCKS_PER_SEC;
+    return elapsed;
+}
+
+/* Doubles the iterations at least, and at most multiplies them by 10, until a run takes min_time seconds */
+static size_t bench_calibrate(bench_function function, double min_time) {
+    size_t iterations = 1;
+    double cpu_seconds, elapsed, multiplier;
+
+    for (;;) {
+        elapsed = bench_measure(function, iterations, &cpu_seconds);
+        if (elapsed >= min_time || iterations >= ((size_t)-1) / 10)
+            return iterations;
+
+        multiplier = elapsed > 0.0 ? min_time * 1.4 / elapsed : 10.0;
+        multiplier = multiplier < 2.0 ? 2.0 : (multiplier > 10.0 ? 10.0 : multiplier);
+        iterations = (size_t)((double)iterations * multiplier);
+    }
+}
+
+static void bench_write_string(FILE* file, const char* value) {
+    fputc('"', file);
+
+    for (; *value; ++value) {
+        if (*value == '"' || *value == '\\')
+            fputc('\\', file);
+
+        fputc(*value, file);
+    }
+
+    fputc('"', file);
+}
+
+/* Accepts the --benchmark_out, --benchmark_repetitions, --benchmark_min_time and --benchmark_filter options of Google Benchmark */
+static int bench_run(int argc, char* argv[], const bench_case* cases, size_t case_count) {
+    const char* out_path = NULL;
+    const char* filter = NULL;
+    int repetitions = 5;
+    double min_time = 0.1;
+    int is_first = 1;
+    FILE* out = NULL;
+    char date[32];
+    time_t now = time(NULL);
+    size_t i, iterations;
+    int arg, repetition;
+    double real_seconds, cpu_seconds;
+
+    for (arg = 1; arg < argc; ++arg) {
+        if (strncmp(argv[arg], "--benchmark_out=", 16) == 0)
+            out_path = argv[arg] + 16;
+        else if (strncmp(argv[arg], "--benchmark_repetitions=", 24) == 0)
+            repetitions = atoi(argv[arg] + 24);
+        else if (strncmp(argv[arg], "--benchmark_min_time=", 21) == 0)
+            min_time = atof(argv[arg] + 21);
+        else if (strncmp(argv[arg], "--benchmark_filter=", 19) == 0)
+            filter = argv[arg] + 19;
+    }
+
+    if (repetitions < 1)
+        repetitions = 1;
+
+    if (out_path) {
+        out = fopen(out_path, "w");
+        if (!out) {
+            fprintf(stderr, "Could not open %s for writing\n", out_path);
+            return 1;
+        }
+
+        strftime(date, sizeof(date), "%Y-%m-%dT%H:%M:%S", localtime(&now));
+        fprintf(out, "{\n  \"context\": {\n    \"date\": \"%s\",\n    \"executable\": ", date);
+        bench_write_string(out, argv[0]);
+#if defined(NDEBUG)
+        fprintf(out, ",\n    \"library_build_type\": \"release\"\n  },\n  \"benchmarks\": [");
+#else
+        fprintf(out, ",\n    \"library_build_type\": \"debug\"\n  },\n  \"benchmarks\": [");
+#endif
+    }
+
+    printf("%-40s %16s %16s %14s\n", "Benchmark", "Time", "CPU", "Iterations");
+
+    for (i = 0; i < case_count; ++i) {
+        if (filter && !strstr(cases[i].name, filter))
+            continue;
+
+        iterations = bench_calibrate(cases[i].function, min_time);
+
+        for (repetition = 0; repetition < repetitions; ++repetition) {
+            real_seconds = bench_measure(cases[i].function, iterations, &cpu_seconds);
+            real_seconds = real_seconds * 1e9 / (double)iterations;
+            cpu_seconds = cpu_seconds * 1e9 / (double)iterations;
+            printf("%-40s %13.2f ns %13.2f ns %14lu\n", cases[i].name, real_seconds, cpu_seconds, (unsigned long)iterations);
+
+            if (!out)
+                continue;
+
+            fprintf(out, "%s\n    {\n      \"name\": ", is_first ? "" : ",");
+            bench_write_string(out, cases[i].name);
+            fprintf(out, ",\n      \"run_name\": ");
+            bench_write_string(out, cases[i].name);
+            fprintf(out, ",\n      \"run_type\": \"iteration\",\n      \"repetitions\": %d,\n      \"repetition_index\": %d,\n"
+                         "      \"threads\": 1,\n      \"iterations\": %lu,\n      \"real_time\": %.6e,\n      \"cpu_time\": %.6e,\n"
+                         "      \"time_unit\": \"ns\"\n    }",
+                    repetitions, repetition, (unsigned long)iterations, real_seconds, cpu_seconds);
+            is_first = 0;
+        }
+    }
+
+    if (out) {
+        fprintf(out, "\n  ]\n}\n");
+        fclose(out);
+    }
+
+    return 0;
+}
+
+#endif"""
+
+    if conf.use_cpp:
+        bench_file_name = 'bench_main.cpp'
+        bench_content = """#include "bench.h"
+
+#include <numeric>
+#include <vector>
+
+static void bench_accumulate(size_t iterations) {
+    std::vector<int> values(1024, 1);
+
+    for (size_t i = 0; i < iterations; ++i) {
+        volatile int sum = std::accumulate(values.begin(), values.end(), 0);
+        (void)sum;
+    }
+}
+
+int main(int argc, char* argv[]) {
+    static const bench_case cases[] = {
+        BENCH_CASE(bench_accumulate)
+    };
+
+    return bench_run(argc, argv, cases, sizeof(cases) / sizeof(cases[0]));
+}"""
+    else:
+        bench_file_name = 'bench_main.c'
+        bench_content = """#include "bench.h"
+
+static void bench_sum(size_t iterations) {
+    static int values[1024];
+    volatile int sum = 0;
+    size_t i, j;
+
+    for (i = 0; i < iterations; ++i) {
+        for (j = 0; j < sizeof(values) / sizeof(values[0]); ++j)
+            sum += values[j];
+    }
+}
+
+int main(int argc, char* argv[]) {
+    static const bench_case cases[] = {
+        BENCH_CASE(bench_sum)
+    };
+
+    return bench_run(argc, argv, cases, sizeof(cases) / sizeof(cases[0]));
+}"""
+
+    bench_dir = gen_dir(cwd, 'bench')
+    gen_file(bench_dir, 'bench.h', bench_h)
+    gen_file(bench_dir, bench_file_name, bench_content)
+
 def gen_docs_dir(cwd: str, conf: ProjectConfig):
     readme_md = r"""<h1 style="text-align: center; color: #ff9400;">Xen CMake C/C++ ProjGen Documentation</h1>
 
@@ -1187,13 +3224,32 @@ Welcome to the documentation of ***`Xen ProjGen`***! Xen ProjGen is a python scr
 <h2 style="text-align: center; color: #ff9400;">Building The Project</h2>
 
 ### **`Prerequisites`**
-To be able to build your project, you have to have at least **CMake 3.15**, **Python3** and any one of the **GCC**, **Clang**, and **MSVC** compilers installed and added to the **PATH** on your system.
+To be able to build your project, you have to have at least **CMake 3.15**, **Python3** (not needed if the project has a *`utils/flags.cmake`* file) and any one of the **GCC**, **Clang**, and **MSVC** compilers installed and added to the **PATH** on your system.
 ### **`Supported Platforms`**
 Since the project structure is fully self-contained and does not include any platform-specific code or features, it should be platform-agnostic and work across different operating systems, including Windows, Linux and macOS. However, it has only been tested on Windows.
 ### **`1 - Building With CMake Tools`**
 If you are using Visual Studio Code to develop your project, you can simply install the CMake Tools extension and use its GUI to configure, build and run the project. This really adds it an IDE-like experience where you can focus on developing and leave the rest to the CMake Tools.
 ### **`2 - Building From The Terminal`**
-Build pipeline of this project is not anything complicated. You can simply configure CMake with the generator and compiler of your choice along with the build type and any other variables you want to set. You can then build it using the *`cmake --build`* command or the build command of the build system you are using. Although building with CMake Tools is easier and quicker, you can gain more control over the build process by using the terminal to build the project. This allows you to make use of toolchain files, preset files, and pass custom or specific flags to CMake, which can be particularly useful for cross-compiling, fine-tuning build configurations, or setting up advanced options not readily accessible through the CMake Tools UI.
+Build pipeline of this project is not anything complicated. You can simply configure CMake with the generator and compiler of your choice along with the build type and any other variables you want to set. You can then build it using the *`cmake --build`* command or the build command of the build system you are using. Although building with CMake Tools is easier and quicker, you can gain more control over the build process by using the terminal to build the project. This allows you to make use of toolchain files, preset files, and pass custom or specific flags to CMake, which can be particularly useful for cross-compiling, fine-tuning build configurations, or setting up advanced options not readily accessible through the CMake Tools UI. Multi-config generators such as *`Ninja Multi-Config`* and *`Visual Studio`* are supported as well, in which case the flags and definitions of each configuration are selected at build time with *`--config`*.
+### **`CMake Presets`**
+If the project was generated with CMake presets, **CMakePresets.json** provides configure, build and test presets named *`debug`*, *`release`*, *`relwithdebinfo`* and *`minsizerel`* (requires **CMake 3.20** and **Ninja**). Each preset uses the **Ninja** generator and its own build directory under **build**, e.g. *`cmake --preset release`*, *`cmake --build --preset release`* and *`ctest --preset release`*, while the binaries are still written to the **out** directory. Builds and tests run in parallel with as many jobs as the generating machine had cores, which can be changed in the hidden *`base`* presets, and failing tests print their output. Projects with profile-guided optimization also get *`pgogenerate`* and *`pgouse`* presets along with a *`pgo-train`* build preset, projects with sanitizer builds get *`asan`*, *`tsan`*, *`ubsan`* and *`msan`* presets, and projects with benchmarking get a *`benchmarks`* build preset that runs them. Machine-specific presets can be added to **CMakeUserPresets.json**, which is ignored by git. CMake Tools picks the presets up automatically.
+### **`Compiler Cache`**
+If the project was generated with the compiler cache option, CMake looks for **ccache** or **sccache** at configure time and uses it to launch the C and C++ compilers, so unchanged files are not recompiled across clean builds. The cache statistics are printed at the end of every build. You can pick the cache directory by setting *`COMPILER_CACHE_DIR`* (e.g. *`-DCOMPILER_CACHE_DIR=/path/to/cache`*) and a specific cache program by setting *`COMPILER_CACHE_PROGRAM`*. If neither program is found, the project builds as usual without a cache.
+### **`Link-Time Optimization`**
+If the project was generated with link-time optimization, CMake checks whether the toolchain supports it at configure time and enables it for **Release**, **RelWithDebInfo** and **MinSizeRel** builds, allowing the compiler to inline and optimize across source files. **Clang** uses ThinLTO, which links much faster. The configure output reports whether it was enabled, and if the toolchain does not support it, the project is built without it. You can turn it off with *`-DUSE_LTO=OFF`*.
+### **`Profile-Guided Optimization`**
+If the project was generated with profile-guided optimization, two extra build types are available: **PgoGenerate** and **PgoUse**. Build the target with **PgoGenerate** to get an instrumented binary, then build the *`pgo_train`* target (e.g. *`cmake --build build --target pgo_train`*) to run it from *`out/bin/PgoGenerate`* and record a profile under *`out/profile`*. Arguments for the training run can be set with *`PGO_TRAINING_ARGS`* (e.g. *`-DPGO_TRAINING_ARGS="--input sample.txt"`*), so pick a workload that resembles real usage. Finally, build with **PgoUse** to optimize the binary using the recorded profile, which is written to *`out/bin/PgoUse`*. **GCC** and **MSVC** use the profile directly, while **Clang** requires *`llvm-profdata`* to merge it, which the *`pgo_train`* target does for you. The flags of both build types can be changed under the *`pgogenerate`* and *`pgouse`* sections of **compiler_flags.yaml**, and they should be kept the same for the profile to match. Record the profile again after changing the source code.
+### **`Sanitizer Builds`**
+If the project was generated with sanitizer builds, extra build types are available for the sanitizers the compiler supports: **Asan** (address), **Tsan** (thread), **Ubsan** (undefined behavior) and **Msan** (memory). **Clang** supports all four, **GCC** all but **Msan**, and **MSVC** only **Asan**, while selecting a build type the compiler does not support stops the configure step. Build with one like any other build type (e.g. *`cmake -S . -B build/tsan -DCMAKE_BUILD_TYPE=Tsan`*), and the binaries are written to their own directory, e.g. *`out/bin/Tsan`* and *`out/test/Tsan`*, so the tests run under the sanitizer with *`ctest`*. The flags of each build type can be changed under the *`asan`*, *`tsan`*, *`ubsan`* and *`msan`* sections of **compiler_flags.yaml**, and the *`-fsanitize`* flags of **GCC** and **Clang** are passed to the linker as well. The memory sanitizer only works if every linked library, including the standard library, is instrumented too, otherwise it reports false positives.
+### **`Source Manifest`**
+By default, CMake globs the **src**, **include** and **test** directories at configure time, so new files are only picked up after CMake is reconfigured. If the project was generated with the source manifest option, the files are listed in **sources.cmake** next to **CMakeLists.txt** instead. After adding, removing or renaming files, update it by running *`xen_projgen.py --sync-sources <project directory>`*. The directories are scanned once, and **sources.cmake** is only rewritten when the set of files has changed, so CMake reconfigures itself on the next build only when it has to.
+### **`Running Tests In Parallel`**
+By default, the files under the **test** directory are built into a single *`tests`* executable, which CTest runs as one test. If the project was generated with split tests, each test file is built into its own executable (so each file needs its own *`main`*) and registered as its own test, named after its path in the **test** directory. This lets CTest run them in parallel. Properties of a test can be set with *`ctest:`* comments in its file, such as *`// ctest: RESOURCE_LOCK database PROCESSORS 2`*. Tests that lock the same resource are never run at the same time, and a test is counted as using as many cores as its **PROCESSORS** value. The *`run_tests`* target builds the tests and runs them with *`ctest -j`*, using as many jobs as there are cores unless *`TEST_JOBS`* is set. To split the tests across machines, set *`TEST_SHARD_COUNT`* to the number of shards and *`TEST_SHARD_INDEX`* to the shard (starting from 0) each machine should run (e.g. *`-DTEST_SHARD_COUNT=4 -DTEST_SHARD_INDEX=1`*).
+### **`Benchmarks`**
+If the project was generated with benchmarking, the files under the **bench** directory are built into a *`benchmarks`* executable, which is written to *`out/bench/<Config>`*. The benchmarks are always compiled with the **release** flags of **compiler_flags.yaml** and the release definitions, whatever the build type is. For library projects, they also link the library target. **bench.h** is a minimal harness for C and C++: each benchmark is a function that runs the measured code a given number of times, listed with *`BENCH_CASE`* in *`main`*. The *`run_benchmarks`* target builds and runs the benchmarks, printing a table and writing the results to *`out/bench/<Config>/benchmarks.json`* in the JSON format of Google Benchmark. The harness accepts the *`--benchmark_repetitions`*, *`--benchmark_min_time`* and *`--benchmark_filter`* options of Google Benchmark, which can be passed through *`BENCHMARK_ARGS`* (e.g. *`-DBENCHMARK_ARGS="--benchmark_repetitions=10"`*). You can also use Google Benchmark itself through the **libs** directory, since the target runs the executable the same way. Build with the **Release** configuration when measuring a library, so the library is optimized as well.
+
+### **`Benchmark Regressions`**
+The *`check_benchmarks`* target runs the benchmarks and compares the results against a rolling history kept in *`out/bench/<Config>/benchmarks_history.json`*, using **utils/bench_history.py** (requires Python). The baseline of each benchmark is made of the samples of the latest *`BENCHMARK_BASELINE_RUNS`* recorded runs (5 by default), so set *`--benchmark_repetitions`* through *`BENCHMARK_ARGS`* for more reliable comparisons. For every benchmark, the median, the median absolute deviation and a bootstrapped 95% confidence interval of the change are printed. A benchmark regresses when its median is slower than the baseline by more than *`BENCHMARK_REGRESSION_THRESHOLD`* percent (5 by default) and the confidence interval does not include zero, in which case the target fails. Regressed results are not recorded, so they do not become part of the baseline. To accept an intended slowdown, run the script with *`--accept`*, e.g. *`py utils/bench_history.py out/bench/Release/benchmarks.json --history out/bench/Release/benchmarks_history.json --accept`*.
 
 [`<-- Prev Page`](readme.md)&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
 [`Main Page`](readme.md)&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
@@ -1218,6 +3274,10 @@ gcc:
     - LIST OF FLAG ENTRIES
   relwithdebinfo:
     - LIST OF FLAG ENTRIES
+  performance:
+    - LIST OF FLAG ENTRIES
+  hardening:
+    - LIST OF FLAG ENTRIES
 clang:
   debug:
 .
@@ -1229,12 +3289,15 @@ where each flag entry looks like:
 - flag: "-Wall" # The flag itself
   description: "Enable most warning messages" # Description for the flag
   documentation: "https://gcc.gnu.org/onlinedocs/gcc/Warning-Options.html#index-Wall" # Link to the documentation page of the flag, if any
+  tags: [warnings] # Optional tags used to select the flag with a profile expression
   enabled: true # Whether the flag is enabled or not (true or false)
 ```
 
-You can enable or disable certain flags using the **enabled** field and add your own flags under designated configurations (e.g., *GCC, Debug*). The **description** and **documentation** fields can be **omitted** when adding new flags.
+You can enable or disable certain flags using the **enabled** field and add your own flags under designated configurations (e.g., *GCC, Debug*). The **description** and **documentation** fields can be **omitted** when adding new flags. Projects generated with sanitizer builds also have *`asan`*, *`tsan`*, *`ubsan`* and *`msan`* sections, listed only under the compilers that support each sanitizer.
+
+Entries can also carry an optional **tags** list (e.g. *`tags: [warnings]`*). The generated file tags the warnings with **warnings**, the sanitizers with **sanitizer**, the fast floating point math flags with **fast-math**, the host-specific code generation flags with **perf** and the frame pointer flags with **profiling**. Besides the build types, each compiler has two profiles: **performance** and **hardening**. The performance profile enables *`-march=native`*, *`-mtune=native`*, *`-fno-plt`* and *`-fno-semantic-interposition`* for **GCC** and **Clang**, and *`/arch:AVX2`*, *`/Gw`* and *`/Gy`* for **MSVC**. The hardening profile enables *`_FORTIFY_SOURCE`*, *`-fstack-protector-strong`* and *`-fstack-clash-protection`* for **GCC** and **Clang**, and *`/GS`* and *`/sdl`* for **MSVC**. Profiles and tags are selected with a profile expression, set through *`COMPILER_FLAGS_PROFILE`* (e.g. *`-DCOMPILER_FLAGS_PROFILE="+perf -warnings"`*). Starting from the enabled flags of each build type, the terms are applied from left to right: *`+name`* adds the enabled entries of the profile with that name and every entry tagged with it, **whether it is enabled or not**, while *`-name`* removes them. A bare name is the same as *`+name`*. The entries of profiles are only added to the build types other than **Debug**, and each flag appears only once, in the order it was added. This way, sanitizer, performance and profiling variants can be built from the same file, e.g. *`+sanitizer -warnings`* or *`+performance +profiling`*. The *`-fsanitize`* flags of **GCC** and **Clang** are passed to the linker as well. Binaries built with the performance profile may not run on other CPUs, so only use it for builds that run on the machine they were built on. To get the flags by hand, pass the expression to fetch_flags.py (e.g. *`fetch_flags.py gcc release --profile "+perf -warnings"`*).
 
-The **compiler_flags.yaml** file is parsed and processed by fetch_flags.py, which retrieves the flags for use in CMake. Since, the script is invoked from within CMake, remember to **reconfigure** your project for any changes made to this file to take effect.
+The **compiler_flags.yaml** file is parsed and processed by fetch_flags.py, which retrieves the flags for use in CMake. fetch_flags.py uses PyYAML when it is installed, with its much faster C loader if PyYAML was built with libyaml, and falls back to a built-in parser that covers the subset of YAML the file uses otherwise. Either way, the file is validated before any flags are returned: a YAML syntax error, an unknown section, an entry without a *`flag`*, a misspelled key or an *`enabled`* value that is not a boolean stops the configure step with the line or the entry at fault. The flags of every compiler and build type are resolved in a single pass and cached under *`build/flags/`*, so the script only runs again when **compiler_flags.yaml** changes. If the project was generated with the native CMake flag parser, *`utils/flags.cmake`* parses the file directly in CMake instead and Python is not needed at all. Deleting *`utils/flags.cmake`* switches back to fetch_flags.py. Changes made to this file are picked up automatically, since CMake **reconfigures** itself on the next build.
 ### **`Adding Preprocessor Definitions`**
 You can define new preprocessor directives by adding entries to the **definitions.txt** file, with each entry separated by a new line. While you can assign string literals or numbers to your directives, but note that most compilers do not allow passing function-style preprocessor macros. Here are some examples:
 ```json
@@ -1284,6 +3347,22 @@ cxx_static_assert
 cxx_variadic_templates
 ```
 After making changes to **compiler_features.txt**, remember to **reconfigure** CMake for the new settings to take effect in your project.
+### **`Configuring Precompiled Headers`**
+If the project was generated with precompiled headers, the config directory also contains a **precompiled_headers.txt** file. The headers listed in it are compiled once and reused by every source file of the target, which saves a lot of compile time for heavy headers such as the STL or Boost. The tests reuse the precompiled headers of the target, unless the target is a dynamic library. Each header should be listed on a new line, either as a system header or as a path relative to the project root. Here are some examples:
+```
+<vector>
+<unordered_map>
+<boost/asio.hpp>
+src/include/common.hpp
+```
+In projects that use both C and C++, wrap the C++ only headers in a generator expression such as *`$<$<COMPILE_LANGUAGE:CXX>:<vector>>`*. Precompiled headers require **CMake 3.16** or newer. After making changes to **precompiled_headers.txt**, remember to **reconfigure** CMake for the new settings to take effect in your project.
+### **`Configuring Unity Builds`**
+If the project was generated with unity builds, the source files of the target and the tests are combined into batches that are compiled as single translation units, which cuts the time of full builds considerably. The number of sources in each batch is set by the *`UNITY_BUILD_BATCH_SIZE`* and *`TESTS_UNITY_BUILD_BATCH_SIZE`* CMake variables (16 by default, 0 puts all sources in one batch), and unity builds can be turned off altogether with *`-DUSE_UNITY_BUILD=OFF`*. Since the sources of a batch share a translation unit, names with internal linkage (e.g. *`static`* functions) can clash between them. You can compile such sources on their own by listing them in the **unity_build_exclude.txt** file, each on a new line, as paths or wildcards relative to the project root. Here are some examples:
+```
+src/legacy/parser.cpp
+src/generated/*.cpp
+```
+Unity builds require **CMake 3.16** or newer. After making changes to **unity_build_exclude.txt**, remember to **reconfigure** CMake for the new settings to take effect in your project.
 
 [`<-- Prev Page`](building.md)&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
 [`Main Page`](readme.md)&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
@@ -1342,7 +3421,7 @@ include("{[(FUNCTIONS_CMAKE_PATH)]}")
 
 project({[(PROJ_NAME)]} VERSION 0.1.0 LANGUAGES{[(LANGS)]})
 {[(LANGUAGE_STANDARDS)]}
-set(TARGET "{[(TARGET_NAME)]}")
+{[(SETUP_COMPILER_CACHE)]}{[(ADD_PGO_CONFIGURATIONS)]}{[(ADD_SANITIZER_CONFIGURATIONS)]}set(TARGET "{[(TARGET_NAME)]}")
 
 # Make a list of useful preprocessor definitions to add to the build
 set(DEFS "")
@@ -1369,10 +3448,9 @@ read_file("{[(CONFIG_PATH)]}linker_flags.txt" LINKER_FLAGS)
 file(GLOB LINK_LIBS {[(LINK_LIBS_WILDCARD)]})
 file(GLOB DY_LIBS {[(DY_LIBS_WILDCARD)]})
 file(GLOB INCLUDE_DIRS {[(INCLUDE_DIRS_WILDCARD)]})
-file(GLOB_RECURSE HEADERS{[(HEADERS_WILDCARD)]})
-file(GLOB_RECURSE SOURCE{[(SOURCE_WILDCARD)]}){[(TEST_FILES_COMMAND)]}
+{[(FIND_SOURCES)]}
 {[(ADD_INCLUDE_DIR)]}
-{[(ADD_TARGET)]}{[(ADD_TEST)]}"""
+{[(ADD_TARGET)]}{[(ADD_TEST)]}{[(ADD_BENCHMARKS)]}{[(ENABLE_UNITY_BUILD)]}{[(ENABLE_LTO)]}{[(ENABLE_PGO)]}{[(ADD_PRECOMPILED_HEADERS)]}{[(COMPILER_CACHE_STATS)]}"""
 
     cmake_root = '${CMAKE_SOURCE_DIR}/'
     source_root = cmake_root
@@ -1391,77 +3469,380 @@ file(GLOB_RECURSE SOURCE{[(SOURCE_WILDCARD)]}){[(TEST_FILES_COMMAND)]}
     functions_cmake_path = f'{proj_root}utils/functions.cmake'
     config_path = f'{proj_root}config/'
 
-    if conf.should_gen_include_dir:
-        include_path_from_source_root = 'src/include' if conf.is_include_dir_inside_src else 'include'
-        add_include_dir =  f'\nlist(APPEND INCLUDE_DIRS "{source_root}{include_path_from_source_root}")\n'
-    else:
-        include_path_from_source_root = 'src'
-        add_include_dir = ''
+    if conf.should_gen_include_dir:
+        include_path_from_source_root = 'src/include' if conf.is_include_dir_inside_src else 'include'
+        add_include_dir =  f'\nlist(APPEND INCLUDE_DIRS "{source_root}{include_path_from_source_root}")\n'
+    else:
+        include_path_from_source_root = 'src'
+        add_include_dir = ''
+
+    languages = ''
+    language_standards = ''
+    headers_wildcard = ''
+    source_wildcard = ''
+    test_files_command = '\nfile(GLOB_RECURSE TESTS'
+
+    if not conf.use_c and conf.should_list_h_files:
+        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.h"'
+
+    if conf.use_c:
+        languages += ' C'
+        language_standards += f"""set(CMAKE_C_STANDARD {conf.c_std})
+set(CMAKE_C_STANDARD_REQUIRED ON)
+"""     
+        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.h"'      
+        source_wildcard += f' "{source_root}src/*.c"'
+        test_files_command += f' "{source_root}test/*.c"'
+    if conf.use_cpp:
+        languages += ' CXX'
+        language_standards += f"""set(CMAKE_CXX_STANDARD {conf.cpp_std})
+set(CMAKE_CXX_STANDARD_REQUIRED ON)
+"""
+        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.hpp"'      
+        source_wildcard += f' "{source_root}src/*.cpp"'
+        test_files_command += f' "{source_root}test/*.cpp"'
+        
+    test_files_command = (test_files_command + ')') if conf.should_include_tests else ''
+
+    if conf.should_include_benchmarks:
+        bench_wildcard = ''.join(f' "{source_root}bench/*.{ext}"' for ext, used in (('c', conf.use_c), ('cpp', conf.use_cpp)) if used)
+        test_files_command += f'\nfile(GLOB_RECURSE BENCHMARKS{bench_wildcard})'
+
+    if conf.use_source_manifest:
+        find_sources = """
+# The sources are listed in sources.cmake, run xen_projgen.py --sync-sources after adding, removing or renaming files
+include("${CMAKE_SOURCE_DIR}/sources.cmake")"""
+    else:
+        find_sources = f"""file(GLOB_RECURSE HEADERS{headers_wildcard})
+file(GLOB_RECURSE SOURCE{source_wildcard}){test_files_command}"""
+
+    target_and_source = '"${TARGET}" "${SOURCE}"'
+    common_params = '"${HEADERS}" "${INCLUDE_DIRS}" "${LINK_LIBS}" "${DY_LIBS}" "${DEFS}" "${FLAGS}" "${FEATURES}" "${LINKER_FLAGS}"'
+    if conf.target_type == 'Executable':
+        add_target = f'add_exec_target({target_and_source} {common_params} FALSE)'
+    elif conf.target_type == 'Dynamic Library':
+        add_target = f'add_lib_target({target_and_source} {common_params} TRUE)'
+    else:
+        add_target = f'add_lib_target({target_and_source} {common_params} FALSE)'
+
+    if conf.should_split_tests:
+        add_test = f"""
+
+# Register each test file as its own test, set its properties with "// ctest: PROPERTY VALUE" comments in the file
+enable_testing()
+add_test_targets("{source_root}test" "${{TESTS}}" {common_params} TEST_TARGETS)
+
+# Run the tests in parallel with the run_tests target, set TEST_SHARD_COUNT and TEST_SHARD_INDEX to only run a shard of them
+cmake_host_system_information(RESULT CORE_COUNT QUERY NUMBER_OF_LOGICAL_CORES)
+set(TEST_JOBS "${{CORE_COUNT}}" CACHE STRING "Number of tests the run_tests target runs in parallel")
+set(TEST_SHARD_COUNT 1 CACHE STRING "Number of shards the tests are split into")
+set(TEST_SHARD_INDEX 0 CACHE STRING "Index of the shard run by the run_tests target, starting from 0")
+add_run_tests_target("${{TEST_JOBS}}" "${{TEST_SHARD_COUNT}}" "${{TEST_SHARD_INDEX}}")"""
+    elif conf.should_include_tests:
+        add_test = """
+add_exec_target("tests" "${TESTS}" """ + f'{common_params}' """ TRUE)
+
+enable_testing()
+add_test(NAME "tests" COMMAND "tests")"""
+    else:
+        add_test = ''
+
+    if conf.should_include_benchmarks:
+        link_target = '' if conf.target_type == 'Executable' else '\nlist(APPEND BENCH_LINK_LIBS "${TARGET}")'
+        bench_params = common_params.replace('"${LINK_LIBS}"', '"${BENCH_LINK_LIBS}"').replace('"${DEFS}"', '"${BENCH_DEFS}"') \
+                                    .replace('"${FLAGS}"', '"${BENCH_FLAGS}"')
+        add_benchmarks = f"""
+
+# Build the benchmarks with the release flags and definitions in every configuration, run them with the run_benchmarks target and
+# compare the results against their history with the check_benchmarks target
+set(BENCH_DEFS "${{COMPILER_DEFINITION}}" "RELEASE" "NDEBUG")
+append_architectural_definitions(BENCH_DEFS)
+append_os_definitions(BENCH_DEFS)
+list(APPEND BENCH_DEFS "${{USER_DEFS}}")
+get_compiler_flags(${{COMPILER_VARIANT}} BENCH_FLAGS Release)
+set(BENCH_LINK_LIBS "${{LINK_LIBS}}"){link_target}
+add_exec_target("benchmarks" "${{BENCHMARKS}}" {bench_params} FALSE "bench")
+add_run_benchmarks_target("benchmarks")
+add_check_benchmarks_target("benchmarks")"""
+    else:
+        add_benchmarks = ''
+
+    if conf.use_unity_build:
+        # Split tests are compiled from a single file each, so they gain nothing from unity builds
+        if conf.should_include_tests and not conf.should_split_tests:
+            tests_batch_size = """
+set(TESTS_UNITY_BUILD_BATCH_SIZE 16 CACHE STRING "Number of sources combined into each unity source of the tests, 0 for all")"""
+            enable_tests_unity_build = """
+    enable_unity_build("tests" "${TESTS_UNITY_BUILD_BATCH_SIZE}" "${UNITY_BUILD_EXCLUDE}")"""
+        else:
+            tests_batch_size = ''
+            enable_tests_unity_build = ''
+
+        enable_unity_build = f"""
+
+# Compile the sources in batches, except the ones listed in unity_build_exclude.txt
+option(USE_UNITY_BUILD "Combine the sources into batches to speed up full builds" ON)
+set(UNITY_BUILD_BATCH_SIZE 16 CACHE STRING "Number of sources combined into each unity source of the target, 0 for all"){tests_batch_size}
+
+if (USE_UNITY_BUILD)
+    read_file("{config_path}unity_build_exclude.txt" UNITY_BUILD_EXCLUDE)
+    enable_unity_build("${{TARGET}}" "${{UNITY_BUILD_BATCH_SIZE}}" "${{UNITY_BUILD_EXCLUDE}}"){enable_tests_unity_build}
+endif()"""
+    else:
+        enable_unity_build = ''
+
+    if conf.use_lto:
+        enable_lto = """
+
+# Use link-time optimization for the optimized builds if the toolchain supports it
+option(USE_LTO "Use link-time optimization for Release, RelWithDebInfo and MinSizeRel builds" ON)
+
+if (USE_LTO)
+    enable_link_time_optimization("${TARGET}")
+endif()"""
+    else:
+        enable_lto = ''
+
+    if conf.use_pgo:
+        profile_dir = f'{cmake_root}build/out/profile' if conf.is_out_in_build_dir else f'{cmake_root}out/profile'
+        add_pgo_configurations = """# Add the PgoGenerate and PgoUse build types for profile-guided optimization
+add_pgo_configurations()
+
+"""
+        enable_pgo = f"""
+
+# Instrument PgoGenerate builds, record a profile with the pgo_train target, then build with PgoUse to optimize using it
+enable_profile_guided_optimization("${{TARGET}}" "{profile_dir}")"""
+    else:
+        add_pgo_configurations = ''
+        enable_pgo = ''
+
+    if conf.use_sanitizer_builds:
+        add_sanitizer_configurations = """# Add the Asan, Tsan, Ubsan and Msan build types the compiler supports, their flags are set in compiler_flags.yaml
+add_sanitizer_configurations()
+
+"""
+    else:
+        add_sanitizer_configurations = ''
+
+    if conf.use_precompiled_headers:
+        # A shared library is compiled as position independent code, so its precompiled headers cannot be reused by the tests
+        reuse_from = '' if conf.target_type == 'Dynamic Library' else '${TARGET}'
+        reuse_comment = ', the tests reuse the ones of the target' if reuse_from else ''
+        add_precompiled_headers = f"""
+
+# Precompile the headers listed in precompiled_headers.txt{reuse_comment}
+read_file("{config_path}precompiled_headers.txt" PRECOMPILED_HEADERS)
+add_precompiled_headers("${{TARGET}}" "${{PRECOMPILED_HEADERS}}" "")"""
+
+        if conf.should_split_tests:
+            add_precompiled_headers += f"""
+
+foreach (TEST_TARGET ${{TEST_TARGETS}})
+    add_precompiled_headers("${{TEST_TARGET}}" "${{PRECOMPILED_HEADERS}}" "{reuse_from}")
+endforeach()"""
+        elif conf.should_include_tests:
+            add_precompiled_headers += f"""
+add_precompiled_headers("tests" "${{PRECOMPILED_HEADERS}}" "{reuse_from}")"""
+    else:
+        add_precompiled_headers = ''
+
+    if conf.use_compiler_cache:
+        setup_compiler_cache = """# Use ccache or sccache, if found, to reuse the results of previous compilations
+set(COMPILER_CACHE_DIR "" CACHE PATH "Directory of the compiler cache, uses the default directory of the cache if empty")
+setup_compiler_cache("${COMPILER_CACHE_DIR}")
+
+"""
+        if conf.should_split_tests:
+            stats_targets = '"${TARGET}" ${TEST_TARGETS}'
+        elif conf.should_include_tests:
+            stats_targets = '"${TARGET}" "tests"'
+        else:
+            stats_targets = '"${TARGET}"'
+
+        if conf.should_include_benchmarks:
+            stats_targets += ' "benchmarks"'
+        compiler_cache_stats = f"""
+
+# Print the compiler cache statistics after the build
+add_compiler_cache_stats({stats_targets})"""
+    else:
+        setup_compiler_cache = ''
+        compiler_cache_stats = ''
+
+    cmake_lists = render_template(cmake_lists,
+        FUNCTIONS_CMAKE_PATH = functions_cmake_path,
+        PROJ_NAME = conf.proj_name,
+        LANGS = languages,
+        LANGUAGE_STANDARDS = language_standards,
+        TARGET_NAME = conf.target_name,
+        CONFIG_PATH = config_path,
+        SET_SOURCE_DIR_OR_EMPTY = set_source_dir,
+        LINK_LIBS_WILDCARD = link_libs_wildcard,
+        DY_LIBS_WILDCARD = dy_libs_wildcard,
+        INCLUDE_DIRS_WILDCARD = include_dirs_wildcard,
+        FIND_SOURCES = find_sources,
+        ADD_INCLUDE_DIR = add_include_dir,
+        ADD_TARGET = add_target,
+        ADD_TEST = add_test,
+        ADD_BENCHMARKS = add_benchmarks,
+        ENABLE_UNITY_BUILD = enable_unity_build,
+        ENABLE_LTO = enable_lto,
+        ENABLE_PGO = enable_pgo,
+        ADD_PGO_CONFIGURATIONS = add_pgo_configurations,
+        ADD_SANITIZER_CONFIGURATIONS = add_sanitizer_configurations,
+        ADD_PRECOMPILED_HEADERS = add_precompiled_headers,
+        SETUP_COMPILER_CACHE = setup_compiler_cache,
+        COMPILER_CACHE_STATS = compiler_cache_stats)
+
+    gen_file(cwd, 'CMakeLists.txt', cmake_lists)
+
+source_root_pattern = re.compile(r'^set\(SOURCE_ROOT "\$\{CMAKE_SOURCE_DIR\}/(.*?)/?"\)', re.MULTILINE)
+source_extensions = ('.c', '.cpp')
+header_extensions = ('.h', '.hpp')
+
+def find_files(cwd: str, dir_names: List[str], extensions: Tuple[str, ...]) -> List[str]:
+    files = set()
+
+    for dir_name in dir_names:
+        for file_path in current_output.get().list_files(os.path.join(cwd, dir_name)):
+            if file_path.endswith(extensions):
+                files.add(os.path.relpath(file_path, cwd).replace(os.sep, '/'))
+
+    return sorted(files)
+
+def sync_sources(proj_dir: str) -> Tuple[int, bool]:
+    cmakelists_path = os.path.join(proj_dir, 'CMakeLists.txt')
+
+    try:
+        with open(cmakelists_path, 'r', encoding = 'utf-8') as file:
+            match = source_root_pattern.search(file.read())
+    except Exception as e:
+        print(f'Error reading file {cmakelists_path}: {e}')
+        sys.exit(4)
+
+    source_root = f'{match.group(1)}/' if match else ''
+    sources_cmake, file_count = render_sources_file(proj_dir, source_root)
+    sources_path = os.path.join(proj_dir, 'sources.cmake')
+
+    try:
+        with open(sources_path, 'r', encoding = 'utf-8') as file:
+            if file.read() == sources_cmake:
+                return file_count, False
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f'Error reading file {sources_path}: {e}')
+        sys.exit(4)
+
+    # Only rewritten when the set of files changes, since CMake reconfigures whenever sources.cmake is touched
+    try:
+        with open(f'{sources_path}.tmp', 'w', encoding = 'utf-8') as file:
+            file.write(sources_cmake)
+
+        os.replace(f'{sources_path}.tmp', sources_path)
+    except Exception as e:
+        print(f'Error writing file {sources_path}: {e}')
+        sys.exit(4)
 
-    languages = ''
-    language_standards = ''
-    headers_wildcard = ''
-    source_wildcard = ''
-    test_files_command = '\nfile(GLOB_RECURSE TESTS'
+    return file_count, True
 
-    if not conf.use_c and conf.should_list_h_files:
-        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.h"'
+def render_sources_file(proj_dir: str, source_root: str) -> Tuple[str, int]:
+    file_lists = {
+        'HEADERS': find_files(proj_dir, [f'{source_root}include', f'{source_root}src'], header_extensions),
+        'SOURCE': find_files(proj_dir, [f'{source_root}src'], source_extensions),
+        'TESTS': find_files(proj_dir, [f'{source_root}test'], source_extensions),
+        'BENCHMARKS': find_files(proj_dir, [f'{source_root}bench'], source_extensions)
+    }
 
-    if conf.use_c:
-        languages += ' C'
-        language_standards += f"""set(CMAKE_C_STANDARD {conf.c_std})
-set(CMAKE_C_STANDARD_REQUIRED ON)
-"""     
-        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.h"'      
-        source_wildcard += f' "{source_root}src/*.c"'
-        test_files_command += f' "{source_root}test/*.c"'
-    if conf.use_cpp:
-        languages += ' CXX'
-        language_standards += f"""set(CMAKE_CXX_STANDARD {conf.cpp_std})
-set(CMAKE_CXX_STANDARD_REQUIRED ON)
+    sources_cmake = """# This file was generated by Xen ProjGen.
+# File: sources.cmake
+# Description: Lists the sources of the project, run xen_projgen.py --sync-sources <project directory> to update it
 """
-        headers_wildcard += f' "{source_root}{include_path_from_source_root}/*.hpp"'      
-        source_wildcard += f' "{source_root}src/*.cpp"'
-        test_files_command += f' "{source_root}test/*.cpp"'
-        
-    test_files_command = (test_files_command + ')') if conf.should_include_tests else ''
 
-    target_and_source = '"${TARGET}" "${SOURCE}"'
-    common_params = '"${HEADERS}" "${INCLUDE_DIRS}" "${LINK_LIBS}" "${DY_LIBS}" "${DEFS}" "${FLAGS}" "${FEATURES}" "${LINKER_FLAGS}"'
-    if target_type == 'Executable':
-        add_target = f'add_exec_target({target_and_source} {common_params} FALSE)'
-    elif target_type == 'Dynamic Library':
-        add_target = f'add_lib_target({target_and_source} {common_params} TRUE)'
-    else:
-        add_target = f'add_lib_target({target_and_source} {common_params} FALSE)'
+    for name, files in file_lists.items():
+        entries = ''.join(f'\n    "${{CMAKE_CURRENT_LIST_DIR}}/{file.replace('"', '\\"').replace('$', '\\$')}"' for file in files)
+        sources_cmake += f'\nset({name}{entries})\n'
 
-    if conf.should_include_tests:
-        add_test = """
-add_exec_target("tests" "${TESTS}" """ + f'{common_params}' """ TRUE)
+    return sources_cmake, sum(len(files) for files in file_lists.values())
 
-enable_testing()
-add_test(NAME "tests" COMMAND "tests")"""
-    else:
-        add_test = ''
+def gen_sources_file(cwd: str, conf: ProjectConfig):
+    if not conf.use_source_manifest:
+        return
 
-    cmake_lists = cmake_lists.replace('{[(FUNCTIONS_CMAKE_PATH)]}', functions_cmake_path)
-    cmake_lists = cmake_lists.replace('{[(PROJ_NAME)]}', conf.proj_name)
-    cmake_lists = cmake_lists.replace('{[(LANGS)]}', languages)
-    cmake_lists = cmake_lists.replace('{[(LANGUAGE_STANDARDS)]}', language_standards)
-    cmake_lists = cmake_lists.replace('{[(TARGET_NAME)]}', conf.target_name)
-    cmake_lists = cmake_lists.replace('{[(CONFIG_PATH)]}', config_path)
-    cmake_lists = cmake_lists.replace('{[(SET_SOURCE_DIR_OR_EMPTY)]}', set_source_dir)
-    cmake_lists = cmake_lists.replace('{[(LINK_LIBS_WILDCARD)]}', link_libs_wildcard)
-    cmake_lists = cmake_lists.replace('{[(DY_LIBS_WILDCARD)]}', dy_libs_wildcard)
-    cmake_lists = cmake_lists.replace('{[(INCLUDE_DIRS_WILDCARD)]}', include_dirs_wildcard)
-    cmake_lists = cmake_lists.replace('{[(HEADERS_WILDCARD)]}', headers_wildcard)
-    cmake_lists = cmake_lists.replace('{[(SOURCE_WILDCARD)]}', source_wildcard)
-    cmake_lists = cmake_lists.replace('{[(TEST_FILES_COMMAND)]}', test_files_command)
-    cmake_lists = cmake_lists.replace('{[(ADD_INCLUDE_DIR)]}', add_include_dir)
-    cmake_lists = cmake_lists.replace('{[(ADD_TARGET)]}', add_target)
-    cmake_lists = cmake_lists.replace('{[(ADD_TEST)]}', add_test)
+    # Listed from what was just generated rather than read back, so it works with every output backend
+    source_root = f'{conf.proj_name}/' if conf.has_proj_name_dir else ''
+    sources_cmake, _ = render_sources_file(cwd, source_root)
+    gen_file(cwd, 'sources.cmake', sources_cmake)
 
-    gen_file(cwd, 'CMakeLists.txt', cmake_lists)
+def gen_cmake_presets_file(cwd: str, conf: ProjectConfig):
+    if not conf.should_gen_cmake_presets:
+        return
+
+    build_types = ['Debug', 'Release', 'RelWithDebInfo', 'MinSizeRel']
+
+    if conf.use_pgo:
+        build_types += ['PgoGenerate', 'PgoUse']
+
+    if conf.use_sanitizer_builds:
+        build_types += ['Asan', 'Tsan', 'Ubsan', 'Msan']
+
+    # Presets can not query the machine, so the jobs default to the core count of the machine generating the project
+    jobs = os.cpu_count() or 1
+
+    configure_presets = [{
+        'name': 'base',
+        'hidden': True,
+        'generator': 'Ninja',
+        'binaryDir': '${sourceDir}/build/${presetName}'
+    }]
+
+    build_presets = [{
+        'name': 'base',
+        'hidden': True,
+        'jobs': jobs
+    }]
+
+    test_presets = [{
+        'name': 'base',
+        'hidden': True,
+        'output': {'outputOnFailure': True},
+        'execution': {'jobs': jobs}
+    }]
+
+    for build_type in build_types:
+        preset_name = build_type.lower()
+        configure_presets.append({
+            'name': preset_name,
+            'displayName': build_type,
+            'inherits': 'base',
+            'cacheVariables': {'CMAKE_BUILD_TYPE': build_type}
+        })
+
+        build_presets.append({'name': preset_name, 'displayName': build_type, 'inherits': 'base', 'configurePreset': preset_name})
+
+        if not build_type.startswith('Pgo'):
+            test_presets.append({'name': preset_name, 'displayName': build_type, 'inherits': 'base', 'configurePreset': preset_name})
+
+    if conf.use_pgo:
+        build_presets.append({'name': 'pgo-train', 'displayName': 'PGO Training Run', 'inherits': 'base',
+                              'configurePreset': 'pgogenerate', 'targets': ['pgo_train']})
+
+    if conf.should_include_benchmarks:
+        build_presets.append({'name': 'benchmarks', 'displayName': 'Benchmarks', 'inherits': 'base',
+                              'configurePreset': 'release', 'targets': ['run_benchmarks']})
+
+    presets = {
+        'version': 2,
+        'cmakeMinimumRequired': {'major': 3, 'minor': 20, 'patch': 0},
+        'configurePresets': configure_presets,
+        'buildPresets': build_presets
+    }
+
+    if conf.should_include_tests:
+        presets['testPresets'] = test_presets
+
+    gen_file(cwd, 'CMakePresets.json', json.dumps(presets, indent = 4) + '\n')
 
 def setup_git(cwd: str, conf: ProjectConfig):
     if not conf.should_init_git:
@@ -1560,7 +3941,9 @@ ENV/
 env/"""
     
     gen_file(cwd, '.gitignore', gitignore)
-    subprocess.run(['git', 'init'], cwd = cwd)
+
+    import subprocess
+    subprocess.run(['git', 'init', '--quiet'], cwd = cwd)
 
     if conf.should_commit_git:
         subprocess.run(['git', 'add', '.'], cwd = cwd)
@@ -1571,6 +3954,7 @@ def preview_proj(conf: ProjectConfig):
 
     print(f'  -- Project Name       :    {conf.proj_name}')
     print(f'  -- VS Code Project    :    {'Yes' if conf.should_gen_vscode_files else 'No'}')
+    print(f'  -- CMake Presets      :    {'Yes' if conf.should_gen_cmake_presets else 'No'}')
     print(f'  -- Target Name        :    {conf.target_name}')
     print(f'  -- Target Type        :    {conf.target_type}')
 
@@ -1594,6 +3978,11 @@ def preview_proj(conf: ProjectConfig):
 
     print(f'  -- Testing            :    {'Enabled' if conf.should_include_tests else 'Disabled'}')
 
+    if conf.should_include_tests:
+        print(f'  ---- Split Tests      :    {'Yes' if conf.should_split_tests else 'No'}')
+
+    print(f'  -- Benchmarking       :    {'Enabled' if conf.should_include_benchmarks else 'Disabled'}')
+
     if not conf.should_init_git:
         git = 'Not Initialize'
     elif not conf.should_commit_git:
@@ -1602,12 +3991,28 @@ def preview_proj(conf: ProjectConfig):
         git = 'Initialize & Commit'
 
     print(f'  -- git                :    {git}')
+    print(f'  -- Flag Parser        :    {'CMake' if conf.use_cmake_flag_parser else 'Python'}')
+    print(f'  -- Compiler Cache     :    {'Enabled' if conf.use_compiler_cache else 'Disabled'}')
+    print(f'  -- Precompiled Headers:    {'Enabled' if conf.use_precompiled_headers else 'Disabled'}')
+    print(f'  -- Unity Build        :    {'Enabled' if conf.use_unity_build else 'Disabled'}')
+    print(f'  -- Link-Time Opt.     :    {'Enabled' if conf.use_lto else 'Disabled'}')
+    print(f'  -- Profile-Guided Opt.:    {'Enabled' if conf.use_pgo else 'Disabled'}')
+    print(f'  -- Sanitizer Builds   :    {'Enabled' if conf.use_sanitizer_builds else 'Disabled'}')
+    print(f'  -- Source Discovery   :    {'sources.cmake' if conf.use_source_manifest else 'Globbing'}')
 
     space =  '    '
     branch = '├── '
     line =   '│   '
     leaf =   '└── '
 
+    config_files = ['compiler_features.txt', 'compiler_flags.yaml', 'definitions.txt', 'linker_flags.txt']
+
+    if conf.use_precompiled_headers:
+        config_files.append('precompiled_headers.txt')
+
+    if conf.use_unity_build:
+        config_files.append('unity_build_exclude.txt')
+
     print(f'\n{conf.proj_name}/')
 
     if conf.should_init_git:
@@ -1621,48 +4026,33 @@ def preview_proj(conf: ProjectConfig):
     
     print(branch + 'build/')
 
+    out_dirs = ['bin', 'lib']
+
+    if conf.should_include_benchmarks:
+        out_dirs.insert(0, 'bench')
+
+    if conf.should_include_tests:
+        out_dirs.append('test')
+
     if conf.is_out_in_build_dir:
         print(line + leaf + 'out/')
-        print(line + space + branch + 'bin/')
-        print(line + space + line + branch + 'Debug/')
-        print(line + space + line + leaf + 'Release/')
-        
-        if conf.should_include_tests:
-            print(line + space + branch + 'lib/')
-            print(line + space + line + branch + 'Debug/')
-            print(line + space + line + leaf + 'Release/')
-            print(line + space + leaf + 'test/')
-            print(line + space + space + branch + 'Debug/')
-            print(line + space + space + leaf + 'Release/')
-        else:
-            print(line + space + leaf + 'lib/')
-            print(line + space + space + branch + 'Debug/')
-            print(line + space + space + leaf + 'Release/')
+        out_prefix = line + space
     else:
         print(branch + 'out/')
-        print(line + branch + 'bin/')
-        print(line + line + branch + 'Debug/')
-        print(line + line + leaf + 'Release/')
+        out_prefix = line
 
-        if conf.should_include_tests:
-            print(line + branch + 'lib/')
-            print(line + line + branch + 'Debug/')
-            print(line + line + leaf + 'Release/')
-            print(line + leaf + 'test/')
-            print(line + space + branch + 'Debug/')
-            print(line + space + leaf + 'Release/')
-        else:
-            print(line + leaf + 'lib/')
-            print(line + space + branch + 'Debug/')
-            print(line + space + leaf + 'Release/')
+    for index, out_dir in enumerate(out_dirs):
+        is_last = index == len(out_dirs) - 1
+        print(out_prefix + (leaf if is_last else branch) + f'{out_dir}/')
+        print(out_prefix + (space if is_last else line) + branch + 'Debug/')
+        print(out_prefix + (space if is_last else line) + leaf + 'Release/')
 
     if conf.has_proj_dir:
         print(branch + 'project/')
         print(line + branch + 'config/')
-        print(line + line + branch + 'compiler_features.txt')
-        print(line + line + branch + 'compiler_flags.yaml')
-        print(line + line + branch + 'definitions.txt')
-        print(line + line + leaf + 'linker_flags.txt')
+
+        for index, config_file in enumerate(config_files):
+            print(line + line + (leaf if index == len(config_files) - 1 else branch) + config_file)
 
         if conf.should_gen_workspace_file:
             print(line + branch + 'utils/')
@@ -1670,56 +4060,76 @@ def preview_proj(conf: ProjectConfig):
             print(line + leaf + 'utils/')
 
         if conf.should_gen_workspace_file:
+            if conf.should_include_benchmarks:
+                print(line + line + branch + 'bench_history.py')
+
             print(line + line + branch + 'fetch_flags.py')
+
+            if conf.use_cmake_flag_parser:
+                print(line + line + branch + 'flags.cmake')
+
             print(line + line + leaf + 'functions.cmake')
             print(line + leaf + f'{conf.proj_name}.code-workspace')
         else:
+            if conf.should_include_benchmarks:
+                print(line + space + branch + 'bench_history.py')
+
             print(line + space + branch + 'fetch_flags.py')
+
+            if conf.use_cmake_flag_parser:
+                print(line + space + branch + 'flags.cmake')
+
             print(line + space + leaf + 'functions.cmake')
     else:
         print(branch + 'config/')
-        print(line + branch + 'compiler_features.txt')
-        print(line + branch + 'compiler_flags.yaml')
-        print(line + branch + 'definitions.txt')
-        print(line + leaf + 'linker_flags.txt')
+
+        for index, config_file in enumerate(config_files):
+            print(line + (leaf if index == len(config_files) - 1 else branch) + config_file)
+
         print(branch + 'utils/')
+
+        if conf.should_include_benchmarks:
+            print(line + branch + 'bench_history.py')
+
         print(line + branch + 'fetch_flags.py')
+
+        if conf.use_cmake_flag_parser:
+            print(line + branch + 'flags.cmake')
+
         print(line + leaf + 'functions.cmake')
 
+    bench_file_name = 'bench_main.cpp' if conf.use_cpp else 'bench_main.c'
+
     if conf.has_proj_name_dir:
         print(branch + f'{conf.proj_name}/')
         print(line + branch + 'libs/')
 
-        if not conf.should_include_tests and (not conf.should_gen_include_dir or conf.is_include_dir_inside_src):
-            print(line + leaf + 'src/')
-        else:
-            print(line + branch + 'src/')
+        is_src_last = not conf.should_include_tests and not conf.should_include_benchmarks and \
+                      (not conf.should_gen_include_dir or conf.is_include_dir_inside_src)
+        src_line = space if is_src_last else line
+        print(line + (leaf if is_src_last else branch) + 'src/')
         
         if conf.is_include_dir_inside_src:
-            if conf.should_include_tests:
-                print(line + line + branch + 'include/')
-            else:
-                print(line + space + branch + 'include/')
+            print(line + src_line + branch + 'include/')
         
-        if conf.should_include_tests or (conf.should_gen_include_dir and not conf.is_include_dir_inside_src):
-            if conf.use_cpp:
-                print(line + line + leaf + 'main.cpp')
-            else:
-                print(line + line + leaf + 'main.c')
+        if conf.use_cpp:
+            print(line + src_line + leaf + 'main.cpp')
         else:
-            if conf.use_cpp:
-                print(line + space + leaf + 'main.cpp')
-            else:
-                print(line + space + leaf + 'main.c')
+            print(line + src_line + leaf + 'main.c')
 
         if conf.should_gen_include_dir and not conf.is_include_dir_inside_src:
-            if conf.should_include_tests:
+            if conf.should_include_tests or conf.should_include_benchmarks:
                 print(line + branch + 'include/')
             else:
                 print(line + leaf + 'include/')
         
         if conf.should_include_tests:
-            print(line + leaf + 'test/')
+            print(line + (branch if conf.should_include_benchmarks else leaf) + 'test/')
+
+        if conf.should_include_benchmarks:
+            print(line + leaf + 'bench/')
+            print(line + space + branch + 'bench.h')
+            print(line + space + leaf + bench_file_name)
     else:
         print(branch + 'libs/')
         print(branch + 'src/')
@@ -1737,6 +4147,11 @@ def preview_proj(conf: ProjectConfig):
         
         if conf.should_include_tests:
             print(branch + 'test/')
+
+        if conf.should_include_benchmarks:
+            print(branch + 'bench/')
+            print(line + branch + 'bench.h')
+            print(line + leaf + bench_file_name)
     
     print(branch + 'docs/')
     print(line + branch + 'readme.md')
@@ -1747,18 +4162,675 @@ def preview_proj(conf: ProjectConfig):
     if conf.should_init_git:
         print(branch + '.gitignore')
 
-    if (conf.has_proj_dir or not conf.should_gen_workspace_file) and not conf.should_gen_readme:
-        print(leaf + 'CMakeLists.txt')
-    elif (conf.has_proj_dir or not conf.should_gen_workspace_file) and conf.should_gen_readme:
-        print(branch + 'CMakeLists.txt')
-        print(leaf + 'README.md')
-    elif (not conf.has_proj_dir and conf.should_gen_workspace_file) and not conf.should_gen_readme:
-        print(branch + 'CMakeLists.txt')
-        print(leaf + f'{conf.proj_name}.code-workspace')
+    root_files = ['CMakeLists.txt']
+
+    if conf.should_gen_cmake_presets:
+        root_files.append('CMakePresets.json')
+
+    if conf.should_gen_readme:
+        root_files.append('README.md')
+
+    if not conf.has_proj_dir and conf.should_gen_workspace_file:
+        root_files.append(f'{conf.proj_name}.code-workspace')
+
+    for index, root_file in enumerate(root_files):
+        print((leaf if index == len(root_files) - 1 else branch) + root_file)
+
+def prompt_proj_config() -> ProjectConfig:
+    proj_name = sanitize_file_name(get_input('Project name: '))
+    target_name_is_proj_name = yes_or_no('Target name matches project name')
+
+    if target_name_is_proj_name:
+        target_name = sanitize_target_name(proj_name)
+    else:
+        target_name = sanitize_target_name(get_input('Target name: '))
+
+    target_type = choose_one_of('Target type', target_types)
+
+    use_c = yes_or_no('Include C')
+
+    c_std = ""
+    cpp_std = ""
+
+    if use_c:
+        c_std = choose_one_of('C Standard', c_standards)[1:]
+
+        if c_std == '89':
+            c_std = '90'
+
+        use_cpp = yes_or_no('Include C++')
     else:
-        print(branch + 'CMakeLists.txt')
-        print(branch + 'README.md')
-        print(leaf + f'{conf.proj_name}.code-workspace')
+        message('Setting the language to C++')
+        use_cpp = True
+
+    if use_cpp:
+        cpp_std = choose_one_of('C++ Standard', cpp_standards)[3:]
+
+    should_list_h_files = use_c
+
+    if use_cpp and not use_c:
+      should_list_h_files = yes_or_no('Allow listing of .h header files')
+
+    should_gen_include_dir = yes_or_no('Add separate include directory')
+    is_include_dir_inside_src = False
+
+    if should_gen_include_dir:
+        is_include_dir_inside_src = yes_or_no('Place include directory inside src')
+
+        if not is_include_dir_inside_src:
+            message('Placing the include directory at the same level as src')
+
+    should_include_tests = yes_or_no('Include testing')
+
+    should_split_tests = False
+    if should_include_tests:
+        should_split_tests = yes_or_no('Register each test file as its own test to run them in parallel (Each test file needs its own main)')
+
+    should_include_benchmarks = yes_or_no('Include benchmarking')
+
+    grouped_dirs = ['libs', 'src']
+
+    if should_gen_include_dir and not is_include_dir_inside_src:
+        grouped_dirs.append('include')
+
+    if should_include_tests:
+        grouped_dirs.append('test')
+
+    if should_include_benchmarks:
+        grouped_dirs.append('bench')
+
+    grouped_dirs = ', '.join(f"'{dir_name}'" for dir_name in grouped_dirs[:-1]) + f", and '{grouped_dirs[-1]}'"
+    has_proj_name_dir = yes_or_no(f"Group {grouped_dirs} directories under a '{proj_name}' directory")
+
+    should_gen_vscode_files = yes_or_no('Generate Visual Studio Code files')
+
+    should_gen_workspace_file = False
+    should_add_src_and_include_dirs_to_ws = False
+
+    if should_gen_vscode_files:
+        should_gen_workspace_file = yes_or_no('Generate workspace file')
+        if should_gen_workspace_file:
+            temp_1 = "and 'include' directories" if should_gen_include_dir else "directory"
+            temp_2 = 'these directories' if should_gen_include_dir else 'the source directory'
+
+            should_add_src_and_include_dirs_to_ws = yes_or_no(f"Add 'src' {temp_1} to workspace (Warning: This could clutter the File "
+                                                 "Explorer and CMake Tools windows, you could also accidentally generate build "
+                                                 f"files under {temp_2} through CMake Tools)")
+
+    should_gen_cmake_presets = yes_or_no('Generate CMakePresets.json (Ninja, parallel builds and tests for every build type)')
+
+    has_proj_dir = yes_or_no("Group 'config' and 'utils' directories"
+                              f"{" along with the workspace file " if should_gen_workspace_file else " "}"
+                              "under a 'project' directory")
+
+    use_cmake_flag_parser = yes_or_no('Parse compiler_flags.yaml natively in CMake instead of Python (Removes the Python requirement)')
+    use_compiler_cache = yes_or_no('Use a compiler cache (ccache or sccache) when available')
+    use_precompiled_headers = yes_or_no('Use precompiled headers (Listed in config/precompiled_headers.txt)')
+    use_unity_build = yes_or_no('Use unity builds (Combines the sources into batches to speed up full builds)')
+    use_lto = yes_or_no('Use link-time optimization for optimized builds when supported')
+
+    use_pgo = False
+    if target_type == 'Executable':
+        use_pgo = yes_or_no('Add profile-guided optimization builds (PgoGenerate, PgoUse) with a training run target')
+
+    use_sanitizer_builds = yes_or_no('Add sanitizer builds (Asan, Tsan, Ubsan, Msan) with their own output directories')
+
+    use_source_manifest = yes_or_no('List the sources in sources.cmake instead of globbing them (Updated with --sync-sources)')
+
+    is_out_in_build_dir = yes_or_no("Place the output directory ('out') inside the 'build' directory")
+
+    should_gen_readme = yes_or_no('Add README.md')
+
+    should_init_git = yes_or_no('Initialize git')
+    should_commit_git = False
+
+    if should_init_git:
+        should_commit_git = yes_or_no('Make initial commit')
+
+    return ProjectConfig(
+        proj_name = proj_name,
+        target_name = target_name,
+        target_type = target_type,
+        use_c = use_c,
+        c_std = c_std,
+        use_cpp = use_cpp,
+        cpp_std = cpp_std,
+        should_list_h_files = should_list_h_files,
+        should_gen_include_dir = should_gen_include_dir,
+        is_include_dir_inside_src = is_include_dir_inside_src,
+        should_include_tests = should_include_tests,
+        should_split_tests = should_split_tests,
+        should_include_benchmarks = should_include_benchmarks,
+        has_proj_name_dir = has_proj_name_dir,
+        should_gen_vscode_files = should_gen_vscode_files,
+        should_gen_workspace_file = should_gen_workspace_file,
+        should_add_src_and_include_dirs_to_ws = should_add_src_and_include_dirs_to_ws,
+        should_gen_cmake_presets = should_gen_cmake_presets,
+        has_proj_dir = has_proj_dir,
+        use_cmake_flag_parser = use_cmake_flag_parser,
+        use_compiler_cache = use_compiler_cache,
+        use_precompiled_headers = use_precompiled_headers,
+        use_unity_build = use_unity_build,
+        use_lto = use_lto,
+        use_pgo = use_pgo,
+        use_sanitizer_builds = use_sanitizer_builds,
+        use_source_manifest = use_source_manifest,
+        is_out_in_build_dir = is_out_in_build_dir,
+        should_gen_readme = should_gen_readme,
+        should_init_git = should_init_git,
+        should_commit_git = should_commit_git)
+
+class ConfigError(Exception):
+    pass
+
+# Raised rather than exiting so that in-process callers can recover, main reports it and exits with code 5
+def config_error(msg: str):
+    raise ConfigError(msg)
+
+def read_spec_file(file_path: str) -> dict:
+    extension = os.path.splitext(file_path)[1].lower()
+
+    try:
+        if extension == '.json':
+            with open(file_path, 'r', encoding = 'utf-8') as file:
+                spec = json.load(file)
+        elif extension == '.toml':
+            import tomllib
+
+            with open(file_path, 'rb') as file:
+                spec = tomllib.load(file)
+        elif extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                config_error('PyYAML is required to read YAML spec files, use a JSON or TOML file instead.')
+
+            with open(file_path, 'r', encoding = 'utf-8') as file:
+                spec = yaml.safe_load(file)
+        else:
+            config_error(f'Unsupported spec file type: {file_path} (expected .json, .toml, .yaml or .yml)')
+    except ConfigError:
+        raise
+    except OSError as e:
+        config_error(f'Error reading spec file {file_path}: {e}')
+    except Exception as e:
+        config_error(f'Error parsing spec file {file_path}: {e}')
+
+    if not isinstance(spec, dict):
+        config_error(f'Spec file {file_path} must contain a mapping of ProjectConfig fields.')
+
+    return spec
+
+def normalize_std(value, prefix: str, choices: List[str]) -> str:
+    std = str(value).upper().removeprefix(prefix.upper())
+
+    if f'{prefix}{std}' not in choices:
+        config_error(f"Invalid {prefix} standard '{value}', expected one of: {', '.join(choices)}")
+
+    return std
+
+def build_proj_config(spec: dict) -> ProjectConfig:
+    unknown = set(spec) - set(ProjectConfig._fields)
+    if unknown:
+        config_error(f"Unknown project settings: {', '.join(sorted(unknown))}")
+
+    values = dict(default_proj_settings)
+    values.update({key: value for key, value in spec.items() if value is not None})
+
+    for field in ProjectConfig._fields:
+        if field not in values:
+            config_error(f"Missing required project setting '{field}'")
+
+        if field in default_proj_settings and isinstance(default_proj_settings[field], bool) and not isinstance(values[field], bool):
+            config_error(f"Project setting '{field}' must be true or false")
+
+    proj_name = sanitize_file_name(str(values['proj_name']))
+    if not proj_name:
+        config_error('Project name cannot be empty')
+
+    target_name = sanitize_target_name(str(values['target_name'] or proj_name))
+
+    target_type = next((choice for choice in target_types if choice.lower() == str(values['target_type']).lower()), None)
+    if not target_type:
+        config_error(f"Invalid target type '{values['target_type']}', expected one of: {', '.join(target_types)}")
+
+    use_c = values['use_c']
+    use_cpp = values['use_cpp'] or not use_c
+    c_std = normalize_std(values['c_std'], 'C', c_standards) if use_c else ''
+    cpp_std = normalize_std(values['cpp_std'], 'C++', cpp_standards) if use_cpp else ''
+
+    if c_std == '89':
+        c_std = '90'
+
+    should_gen_include_dir = values['should_gen_include_dir']
+    should_gen_vscode_files = values['should_gen_vscode_files']
+    should_gen_workspace_file = should_gen_vscode_files and values['should_gen_workspace_file']
+    should_init_git = values['should_init_git']
+
+    return ProjectConfig(
+        proj_name = proj_name,
+        target_name = target_name,
+        target_type = target_type,
+        use_c = use_c,
+        c_std = c_std,
+        use_cpp = use_cpp,
+        cpp_std = cpp_std,
+        should_list_h_files = use_c or values['should_list_h_files'],
+        should_gen_include_dir = should_gen_include_dir,
+        is_include_dir_inside_src = should_gen_include_dir and values['is_include_dir_inside_src'],
+        should_include_tests = values['should_include_tests'],
+        should_split_tests = values['should_include_tests'] and values['should_split_tests'],
+        should_include_benchmarks = values['should_include_benchmarks'],
+        has_proj_name_dir = values['has_proj_name_dir'],
+        should_gen_vscode_files = should_gen_vscode_files,
+        should_gen_workspace_file = should_gen_workspace_file,
+        should_add_src_and_include_dirs_to_ws = should_gen_workspace_file and values['should_add_src_and_include_dirs_to_ws'],
+        should_gen_cmake_presets = values['should_gen_cmake_presets'],
+        has_proj_dir = values['has_proj_dir'],
+        use_cmake_flag_parser = values['use_cmake_flag_parser'],
+        use_compiler_cache = values['use_compiler_cache'],
+        use_precompiled_headers = values['use_precompiled_headers'],
+        use_unity_build = values['use_unity_build'],
+        use_lto = values['use_lto'],
+        use_pgo = target_type == 'Executable' and values['use_pgo'],
+        use_sanitizer_builds = values['use_sanitizer_builds'],
+        use_source_manifest = values['use_source_manifest'],
+        is_out_in_build_dir = values['is_out_in_build_dir'],
+        should_gen_readme = values['should_gen_readme'],
+        should_init_git = should_init_git,
+        should_commit_git = should_init_git and values['should_commit_git'])
+
+def gen_proj_tree(cwd: str, conf: ProjectConfig) -> str:
+    root_dir = gen_dir(cwd, conf.proj_name)
+    gen_vscode_dir(root_dir, conf)
+    gen_build_dir(root_dir, conf)
+    gen_proj_dir(root_dir, conf)
+    gen_proj_name_dir(root_dir, conf)
+    gen_docs_dir(root_dir, conf)
+    gen_cmakelists_file(root_dir, conf)
+    gen_sources_file(root_dir, conf)
+    gen_cmake_presets_file(root_dir, conf)
+    gen_readme_file(root_dir, conf)
+    setup_git(root_dir, conf)
+    return root_dir
+
+def gen_proj(cwd: str, conf: ProjectConfig) -> str:
+    if not isinstance(current_output.get(), DiskOutput):
+        return gen_proj_tree(cwd, conf)
+
+    proj_dir = os.path.join(cwd, conf.proj_name)
+    if os.path.lexists(proj_dir):
+        print(f'Error creating directory {proj_dir}: it already exists')
+        sys.exit(4)
+
+    # Generated in a hidden directory next to the target and published with a single rename, so the project either
+    # appears complete or not at all. Being next to the target keeps it on the same file system, which rename requires
+    staging_dir = os.path.join(cwd, f'.{conf.proj_name}.staging-{os.getpid()}-{os.urandom(4).hex()}')
+
+    try:
+        os.mkdir(staging_dir)
+    except OSError as e:
+        print(f'Error creating directory {staging_dir}: {e}')
+        sys.exit(4)
+
+    try:
+        gen_proj_tree(staging_dir, conf)
+        os.rename(os.path.join(staging_dir, conf.proj_name), proj_dir)
+    except BaseException as e:
+        import shutil
+        shutil.rmtree(staging_dir, ignore_errors = True)
+
+        if isinstance(e, OSError):
+            print(f'Error generating {proj_dir}: {e}')
+            sys.exit(4)
+
+        raise
+
+    os.rmdir(staging_dir)
+    return proj_dir
+
+def generate(conf: ProjectConfig, root: str, output = None) -> str:
+    # Entry point for in-process use, neither prompts nor prints. The settings are validated and their dependent
+    # options resolved the same way as a spec file's, so a hand-built ProjectConfig behaves like one from the script
+    conf = build_proj_config(conf._asdict())
+    output = output or DiskOutput()
+
+    if conf.should_init_git and not isinstance(output, DiskOutput):
+        config_error('git can only be initialized when generating the project to disk')
+
+    token = current_output.set(output)
+    try:
+        return gen_proj(root, conf)
+    finally:
+        current_output.reset(token)
+
+def gen_manifest_entry(spec: dict, cwd: str) -> Tuple[str, float, Optional[str]]:
+    # Runs inside a worker process, so failures are returned rather than allowed to exit
+    name = str(spec.get('proj_name', '<unnamed>'))
+    output = io.StringIO()
+    start = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(output):
+            gen_proj(cwd, build_proj_config(spec))
+    except ConfigError as e:
+        return name, time.perf_counter() - start, str(e)
+    except (Exception, SystemExit) as e:
+        lines = [line for line in output.getvalue().splitlines() if line.strip()]
+        error = lines[-1].lstrip('#! ') if lines else (str(e) or type(e).__name__)
+        return name, time.perf_counter() - start, error
+
+    return name, time.perf_counter() - start, None
+
+def gen_manifest(manifest_path: str, cwd: str, jobs: Optional[int]):
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    manifest = read_spec_file(manifest_path)
+    defaults = manifest.get('defaults', {})
+    projects = manifest.get('projects')
+
+    if not isinstance(defaults, dict):
+        config_error(f"'defaults' in manifest {manifest_path} must be a mapping of ProjectConfig fields")
+
+    if not isinstance(projects, list) or not projects or not all(isinstance(project, dict) for project in projects):
+        config_error(f"Manifest {manifest_path} must contain a non-empty 'projects' list of ProjectConfig mappings")
+
+    if jobs is not None and jobs < 1:
+        config_error('The number of jobs must be at least 1')
+
+    specs = [{**defaults, **project} for project in projects]
+    failures = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers = jobs) as executor:
+        futures = [executor.submit(gen_manifest_entry, spec, cwd) for spec in specs]
+
+        for index, future in enumerate(as_completed(futures), start = 1):
+            name, seconds, error = future.result()
+
+            if error:
+                failures += 1
+                warning(f'[{index}/{len(specs)}] {name}: failed after {seconds:.3f}s ({error})')
+            else:
+                message(f'[{index}/{len(specs)}] {name}: generated in {seconds:.3f}s')
+
+    message(f'Generated {len(specs) - failures} of {len(specs)} projects in {time.perf_counter() - start:.3f}s')
+
+    if failures:
+        sys.exit(6)
+
+class LatencyHistogram:
+    # Cumulative histogram in the Prometheus text format, only updated from the event loop thread
+    buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+    def __init__(self):
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[index] += 1
+
+        self.total += seconds
+        self.count += 1
+
+    def render(self, name: str, labels: str = '') -> List[str]:
+        separator = ',' if labels else ''
+        lines = [f'{name}_bucket{{{labels}{separator}le="{bound}"}} {count}' for bound, count in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total:.6f}' if labels else f'{name}_sum {self.total:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}' if labels else f'{name}_count {self.count}')
+        return lines
+
+http_reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 408: 'Request Timeout',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+max_request_body = 1024 * 1024
+request_timeout = 30
+
+class HttpError(Exception):
+    def __init__(self, status: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+
+def gen_archive(conf: ProjectConfig) -> bytes:
+    # Runs on a worker thread, the project never touches the disk
+    stream = io.BytesIO()
+
+    with ArchiveOutput(stream, 'zip') as output:
+        generate(conf, '', output)
+
+    return stream.getvalue()
+
+class ScaffoldServer:
+    # Serves POST /generate with a ProjectConfig JSON body, answered with the zipped project, and GET /metrics
+    def __init__(self, jobs: int):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.jobs = jobs
+        self.executor = ThreadPoolExecutor(max_workers = jobs, thread_name_prefix = 'projgen')
+        self.slots = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.responses = {}
+        self.request_latency = {}
+        self.generation_latency = LatencyHistogram()
+
+        # Generating a throwaway project once loads the lazily imported modules and parses the templates up front
+        gen_archive(build_proj_config({'proj_name': 'warmup'}))
+
+    async def handle_connection(self, reader, writer):
+        import asyncio
+
+        start = time.perf_counter()
+        method = path = '-'
+
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(self.read_request(reader), request_timeout)
+                status, content_type, content, headers = await self.route(method, path, body)
+            except asyncio.TimeoutError:
+                status, content_type, content, headers = 408, 'text/plain', b'Request timed out\n', {}
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError:
+                status, content_type, content, headers = 400, 'text/plain', b'Request headers are too large\n', {}
+            except HttpError as e:
+                status, content_type, content, headers = e.status, 'text/plain', f'{e}\n'.encode(), {}
+
+            head = [f'HTTP/1.1 {status} {http_reasons[status]}', f'Content-Type: {content_type}',
+                    f'Content-Length: {len(content)}', 'Connection: close']
+            head += [f'{key}: {value}' for key, value in headers.items()]
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + content)
+            await writer.drain()
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+
+        # The metrics endpoint is left out so that scraping does not skew the latencies
+        if path != '/metrics':
+            seconds = time.perf_counter() - start
+            self.responses[status] = self.responses.get(status, 0) + 1
+            self.request_latency.setdefault(str(status), LatencyHistogram()).observe(seconds)
+            message(f'{method} {path} {status} {seconds * 1000:.1f}ms')
+
+    async def read_request(self, reader) -> Tuple[str, str, bytes]:
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+
+        if len(parts) != 3:
+            raise HttpError(400, 'Malformed request line')
+
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HttpError(400, 'Invalid Content-Length') from None
+
+        if length < 0:
+            raise HttpError(400, 'Invalid Content-Length')
+
+        if length > max_request_body:
+            raise HttpError(413, f'Request body is larger than {max_request_body} bytes')
+
+        body = await reader.readexactly(length) if length > 0 else b''
+        return parts[0], parts[1].split('?', 1)[0], body
+
+    async def route(self, method: str, path: str, body: bytes):
+        if path == '/metrics':
+            if method != 'GET':
+                return 405, 'text/plain', b'Use GET\n', {'Allow': 'GET'}
+
+            return 200, 'text/plain; version=0.0.4', self.render_metrics().encode(), {}
+
+        if path == '/generate':
+            if method != 'POST':
+                return 405, 'text/plain', b'Use POST with a ProjectConfig JSON body\n', {'Allow': 'POST'}
+
+            return await self.generate_project(body)
+
+        return 404, 'text/plain', b'Not found, use POST /generate or GET /metrics\n', {}
+
+    async def generate_project(self, body: bytes):
+        import asyncio
+
+        try:
+            spec = json.loads(body)
+        except ValueError as e:
+            return 400, 'text/plain', f'Invalid JSON: {e}\n'.encode(), {}
+
+        if not isinstance(spec, dict):
+            return 400, 'text/plain', b'The body must be a JSON object of ProjectConfig fields\n', {}
+
+        try:
+            conf = build_proj_config(spec)
+        except ConfigError as e:
+            return 400, 'text/plain', f'{e}\n'.encode(), {}
+
+        if conf.should_init_git:
+            return 400, 'text/plain', b'git can not be initialized in a served project, set should_init_git to false\n', {}
+
+        # At most jobs projects are generated at once, the rest of the requests wait for a free worker
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.jobs)
+
+        self.waiting += 1
+        async with self.slots:
+            self.waiting -= 1
+            self.in_flight += 1
+            start = time.perf_counter()
+
+            try:
+                archive = await asyncio.get_running_loop().run_in_executor(self.executor, gen_archive, conf)
+            except (Exception, SystemExit) as e:
+                return 500, 'text/plain', f'Generating {conf.proj_name} failed: {e}\n'.encode(), {}
+            finally:
+                self.in_flight -= 1
+                self.generation_latency.observe(time.perf_counter() - start)
+
+        return 200, 'application/zip', archive, {'Content-Disposition': f'attachment; filename="{conf.proj_name}.zip"'}
+
+    def render_metrics(self) -> str:
+        lines = ['# HELP projgen_request_duration_seconds Time from accepting a request to sending its response',
+                 '# TYPE projgen_request_duration_seconds histogram']
+        for status, histogram in sorted(self.request_latency.items()):
+            lines += histogram.render('projgen_request_duration_seconds', f'status="{status}"')
+
+        lines += ['# HELP projgen_generation_duration_seconds Time a worker took to generate and zip a project',
+                  '# TYPE projgen_generation_duration_seconds histogram']
+        lines += self.generation_latency.render('projgen_generation_duration_seconds')
+
+        lines += ['# HELP projgen_responses_total Responses sent, by status code', '# TYPE projgen_responses_total counter']
+        lines += [f'projgen_responses_total{{status="{status}"}} {count}' for status, count in sorted(self.responses.items())]
+
+        lines += ['# HELP projgen_generations_in_flight Projects being generated', '# TYPE projgen_generations_in_flight gauge',
+                  f'projgen_generations_in_flight {self.in_flight}',
+                  '# HELP projgen_generations_waiting Requests waiting for a free worker', '# TYPE projgen_generations_waiting gauge',
+                  f'projgen_generations_waiting {self.waiting}',
+                  '# HELP projgen_workers Size of the worker pool', '# TYPE projgen_workers gauge',
+                  f'projgen_workers {self.jobs}']
+
+        return '\n'.join(lines) + '\n'
+
+def serve(address: str, jobs: Optional[int]):
+    import asyncio
+
+    host, _, port = address.rpartition(':')
+    host = host.strip('[]') or '127.0.0.1'
+
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        config_error(f"Invalid address '{address}', expected [HOST:]PORT (e.g. 127.0.0.1:8080)")
+
+    if jobs is not None and jobs < 1:
+        config_error('The number of jobs must be at least 1')
+
+    server = ScaffoldServer(jobs or os.cpu_count() or 1)
+
+    async def run():
+        listener = await asyncio.start_server(server.handle_connection, host, int(port))
+        message(f'Serving on http://{host}:{port} with {server.jobs} workers (POST /generate, GET /metrics), press Ctrl+C to stop')
+
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        message('Server stopped')
+    except OSError as e:
+        config_error(f'Could not listen on {host}:{port}: {e}')
+    finally:
+        server.executor.shutdown(wait = False, cancel_futures = True)
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog = 'xen_projgen.py',
+        description = 'Generates a C/C++ project with a pre-configured CMake setup for a single target. '
+                      'Runs interactively unless a spec file or any project setting is passed.')
+
+    spec_source = parser.add_mutually_exclusive_group()
+    spec_source.add_argument('-c', '--config', metavar = 'FILE',
+                        help = 'JSON, TOML or YAML file with ProjectConfig fields, command line settings take precedence')
+    spec_source.add_argument('-m', '--manifest', metavar = 'FILE',
+                        help = "JSON, TOML or YAML file with a 'projects' list of ProjectConfig mappings and optional "
+                               "shared 'defaults', generated concurrently")
+    spec_source.add_argument('-s', '--sync-sources', metavar = 'DIR',
+                        help = 'rewrite sources.cmake of the generated project in DIR if its source, header or test files changed')
+    spec_source.add_argument('--serve', metavar = '[HOST:]PORT',
+                        help = 'run an HTTP server answering POST /generate with a ProjectConfig JSON body with the zipped '
+                               'project, and GET /metrics with its latency histograms (host defaults to 127.0.0.1)')
+    parser.add_argument('-o', '--output-dir', metavar = 'DIR', default = os.getcwd(),
+                        help = 'directory to generate the project(s) under (default: current directory)')
+    parser.add_argument('-j', '--jobs', metavar = 'N', type = int, default = None,
+                        help = 'number of worker processes for --manifest or worker threads for --serve (default: number of CPUs)')
+
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('-a', '--archive', metavar = 'FORMAT', choices = ArchiveOutput.archive_formats,
+                        help = 'stream the project to stdout as a tar.gz or zip archive instead of writing it under --output-dir')
+    output.add_argument('-n', '--dry-run', action = 'store_true',
+                        help = 'generate the project in memory and list its files without writing anything')
+
+    settings = parser.add_argument_group('project settings')
+    for field in ProjectConfig._fields:
+        flag = '--' + field.replace('_', '-')
+        if field in ('proj_name', 'target_name'):
+            settings.add_argument(flag, dest = field)
+        elif field == 'target_type':
+            settings.add_argument(flag, dest = field, choices = target_types)
+        elif field in ('c_std', 'cpp_std'):
+            settings.add_argument(flag, dest = field, metavar = 'STD')
+        else:
+            settings.add_argument(flag, dest = field, action = argparse.BooleanOptionalAction)
+
+    return parser.parse_args(argv)
 
 title_art = r"""
   __   __               _____       __  _____               ______          _ _____            
@@ -1778,140 +4850,85 @@ title_art = r"""
 ║  Description: Generates a C/C++ project with a pre-configured CMake setup for a single target  ║
 ║                                                                                                ║
 ╚════════════════════════════════════════════════════════════════════════════════════════════════╝"""
-print(title_art)
 
-bool_response = yes_or_no(f'Generate a project under {os.getcwd()}')
-if not bool_response:
-    sys.exit(2)
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
 
-proj_name = sanitize_file_name(get_input('Project name: '))
-target_name_is_proj_name = yes_or_no('Target name matches project name')
+    # The archive takes stdout, so the prompts and messages are printed to stderr instead
+    archive_stream = sys.stdout.buffer if args.archive else None
+    with contextlib.redirect_stdout(sys.stderr) if args.archive else contextlib.nullcontext():
+        try:
+            run_cli(args, archive_stream)
+        except ConfigError as e:
+            warning(str(e))
+            sys.exit(5)
 
-if target_name_is_proj_name:
-    target_name = sanitize_target_name(proj_name)
-else:
-    target_name = sanitize_target_name(get_input('Target name: '))
+def run_cli(args: argparse.Namespace, archive_stream):
+    cli_settings = {field: getattr(args, field) for field in ProjectConfig._fields if getattr(args, field) is not None}
 
-target_type = choose_one_of('Target type', ['Executable', 'Dynamic Library', 'Static Library'])
+    if (args.sync_sources or args.manifest or args.serve) and (args.archive or args.dry_run):
+        config_error('--archive and --dry-run only apply to generating a single project.')
 
-use_c = yes_or_no('Include C')
+    if args.serve:
+        if cli_settings:
+            config_error('Project settings cannot be passed along with --serve, send them with each request instead.')
 
-c_std = ""
-cpp_std = ""
+        serve(args.serve, args.jobs)
+        return
 
-if use_c:
-    c_std = choose_one_of('C Standard', ['C89', 'C90', 'C99', 'C11', 'C17', 'C23'])[1:]
+    if args.sync_sources:
+        if cli_settings:
+            config_error('Project settings cannot be passed along with --sync-sources.')
 
-    if c_std == '89':
-        c_std = '90'
+        file_count, is_changed = sync_sources(args.sync_sources)
+        message(f"{'Updated' if is_changed else 'No changes to'} sources.cmake ({file_count} files)")
+        return
+
+    if args.manifest:
+        if cli_settings:
+            config_error('Project settings cannot be passed along with a manifest, use its defaults instead.')
+
+        gen_manifest(args.manifest, args.output_dir, args.jobs)
+        return
+
+    if args.config or cli_settings:
+        spec = read_spec_file(args.config) if args.config else {}
+        spec.update(cli_settings)
+        conf = build_proj_config(spec)
+    else:
+        print(title_art)
+
+        bool_response = yes_or_no(f'Generate a project under {args.output_dir}')
+        if not bool_response:
+            sys.exit(2)
+
+        conf = prompt_proj_config()
+        preview_proj(conf)
+
+        print('')
+        bool_response = yes_or_no('Confirm project')
+        if not bool_response:
+            sys.exit(3)
+
+    if archive_stream:
+        with ArchiveOutput(archive_stream, args.archive) as output:
+            generate(conf, '', output)
+    elif args.dry_run:
+        output = MemoryOutput()
+        generate(conf, args.output_dir, output)
+
+        print('')
+        for file_path in sorted(output.files):
+            print(f'  {os.path.relpath(file_path, args.output_dir)} ({len(output.files[file_path].encode('utf-8'))} bytes)')
+
+        print('')
+        message(f'Dry run, {len(output.files)} files and {len(output.dirs)} directories would be generated under {args.output_dir}')
+        return
+    else:
+        gen_proj(args.output_dir, conf)
+
+    print('')
+    message('Project Successfully Generated!')
 
-    use_cpp = yes_or_no('Include C++')
-else:
-    message('Setting the language to C++')
-    use_cpp = True
-
-if use_cpp:
-    cpp_std = choose_one_of('C++ Standard', ['C++98', 'C++11', 'C++14', 'C++17', 'C++20', 'C++23', 'C++26'])[3:]
-
-should_list_h_files = use_c
-
-if use_cpp and not use_c:
-  should_list_h_files = yes_or_no('Allow listing of .h header files')
-
-should_gen_include_dir = yes_or_no('Add separate include directory')
-is_include_dir_inside_src = False
-
-if should_gen_include_dir:
-    is_include_dir_inside_src = yes_or_no('Place include directory inside src')
-
-    if not is_include_dir_inside_src:
-        message('Placing the include directory at the same level as src')
-
-should_include_tests = yes_or_no('Include testing')
-
-mention_include = should_gen_include_dir and not is_include_dir_inside_src
-if mention_include and should_include_tests:
-    temp_1 = ''
-    temp_2 = ", 'include', and 'test'"
-elif mention_include and not should_include_tests:
-    temp_1 = ''
-    temp_2 = ", and 'include'"
-elif not mention_include and should_include_tests:
-    temp_1 = ''
-    temp_2 = ", and 'test'"
-else:
-    temp_1 = ' and'
-    temp_2 = ''
-
-has_proj_name_dir = yes_or_no(f"Group 'libs',{temp_1} 'src'{temp_2} directories under a '{proj_name}' directory")
-
-should_gen_vscode_files = yes_or_no('Generate Visual Studio Code files')
-
-should_gen_workspace_file = False
-should_add_src_and_include_dirs_to_ws = False
-
-if should_gen_vscode_files:
-    should_gen_workspace_file = yes_or_no('Generate workspace file')
-    if should_gen_workspace_file:
-        temp_1 = "and 'include' directories" if should_gen_include_dir else "directory"
-        temp_2 = 'these directories' if should_gen_include_dir else 'the source directory'
-
-        should_add_src_and_include_dirs_to_ws = yes_or_no(f"Add 'src' {temp_1} to workspace (Warning: This could clutter the File "
-                                             "Explorer and CMake Tools windows, you could also accidentally generate build "
-                                             f"files under {temp_2} through CMake Tools)")
-
-has_proj_dir = yes_or_no("Group 'config' and 'utils' directories"
-                          f"{" along with the workspace file " if gen_workspace_file else " "}"
-                          "under a 'project' directory")
-
-is_out_in_build_dir = yes_or_no("Place the output directory ('out') inside the 'build' directory")
-
-should_gen_readme = yes_or_no('Add README.md')
-
-should_init_git = yes_or_no('Initialize git')
-should_commit_git = False
-
-if should_init_git:
-    should_commit_git = yes_or_no('Make initial commit')
-
-conf = ProjectConfig(
-    proj_name,
-    target_name,
-    target_type,
-    use_c,
-    c_std,
-    use_cpp,
-    cpp_std,
-    should_list_h_files,
-    should_gen_include_dir,
-    is_include_dir_inside_src,
-    should_include_tests,
-    has_proj_name_dir,
-    should_gen_vscode_files,
-    should_gen_workspace_file,
-    should_add_src_and_include_dirs_to_ws,
-    has_proj_dir,
-    is_out_in_build_dir,
-    should_gen_readme,
-    should_init_git,
-    should_commit_git)
-
-preview_proj(conf)
-
-print('')
-bool_response = yes_or_no('Confirm project')
-if not bool_response:
-    sys.exit(3)
-
-root_dir = gen_dir(os.getcwd(), conf.proj_name)
-gen_vscode_dir(root_dir, conf)
-gen_build_dir(root_dir, conf)
-gen_proj_dir(root_dir, conf)
-gen_proj_name_dir(root_dir, conf)
-gen_docs_dir(root_dir, conf)
-gen_cmakelists_file(root_dir, conf)
-gen_readme_file(root_dir, conf)
-setup_git(root_dir, conf)
-
-print('')
-message('Project Successfully Generated!')
+if __name__ == '__main__':
+    main()